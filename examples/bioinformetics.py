@@ -1,10 +1,24 @@
 import sys
 sys.path.append("../")
-from utils.edit_distance import NeedlemanWunsch
+from utils.edit_distance import NeedlemanWunsch, SmithWaterman, SubstitutionMatrix
 
 sequence_1 = "ATGGTGCATCTGACTCCTGAGG"
 sequence_2 = "ATGGTGCACCTGACTCCTGAGG"
 solver = NeedlemanWunsch(match_score=1, mismatch_score=-1, gap_penalty=-1)
 
 print(solver(sequence_1, sequence_2))
-print(solver.subproblem_map)
\ No newline at end of file
+print(solver.subproblem_map)
+
+# The alignment itself, recovered in linear memory, so that real genes 
+# of tens of thousands of bases fit as well as these toy sequences
+score, aligned_1, aligned_2, cigar = solver.align(sequence_1, sequence_2)
+print(score, cigar)
+print(aligned_1)
+print(aligned_2)
+
+# Local alignment of a protein fragment with BLOSUM62 and affine gaps,
+# and the best hits of the fragment in a small database
+matrix = SubstitutionMatrix.load("../data/matrices/BLOSUM62", unknown="X")
+solver = SmithWaterman(gap_penalty=-11, gap_extend=-1, matrix=matrix)
+print(solver("HEAGAWGHEE", "PAWHEAE"))
+print(solver.top_hits("PAWHEAE", ["HEAGAWGHEE", "MKV", "PAWHEA"], k=2))
@@ -0,0 +1,36 @@
+"""
+Memory and speed of the subproblem map of Levenshtein per integer dtype.
+update_words picks the narrowest dtype holding the longer word, so short words
+keep small cache-friendly maps, while a map of uint8 would silently wrap around
+for words longer than 254 characters.
+"""
+import sys
+sys.path.append("../")
+import random
+import time
+import numpy as np
+from utils.edit_distance import Levenshtein
+from utils.edit_distance.dtypes import UNSIGNED
+
+random.seed(0)
+solver = Levenshtein()
+for length in (50, 200, 400):
+    word_1 = "".join(random.choice("abcdefghij") for _ in range(length))
+    word_2 = "".join(random.choice("abcdefghij") for _ in range(length))
+    expected = solver.distance(word_1, word_2)
+    solver.update_words(word_1, word_2)
+    print("Length {}, distance {}, dtype picked {}".format(length, expected, solver.subproblem_map.dtype))
+
+    for dtype in UNSIGNED[:3]:
+        solver.update_words(word_1, word_2)
+        # Forcing the dtype, with the boundary values wrapped around as they would be
+        with np.errstate(over="ignore"):
+            solver.subproblem_map = solver.subproblem_map.astype(np.int64).astype(dtype)
+            start = time.perf_counter()
+            solver.run()
+            elapsed = time.perf_counter() - start
+        distance = int(solver.subproblem_map[-1, -1])
+        print("    {:>7}: {:>9} bytes, {:.3f} s, distance {}{}".format(
+            np.dtype(dtype).name, solver.subproblem_map.nbytes, elapsed, distance,
+            "" if distance == expected else " (wrapped around)"
+        ))
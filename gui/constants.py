@@ -1,19 +1,4 @@
 
-SPECIAL_CHARS = []
-for i in range(33, 48):
-    SPECIAL_CHARS.append(chr(i))
-
-for i in range(58, 65):
-    SPECIAL_CHARS.append(chr(i))
-    
-for i in range(91, 97):
-    SPECIAL_CHARS.append(chr(i))
-
-for i in range(123, 127):
-    SPECIAL_CHARS.append(chr(i))
-
-SPECIAL_CHARS.remove("'")
-
 DICTIONARY_PATH = "./data/dictionary.json"
 BIGRAM_PATH = "./data/bigram_dictionary.json"
 
@@ -21,6 +6,8 @@ BIGRAM_PATH = "./data/bigram_dictionary.json"
 import sys
 sys.path.append("../")
 from utils.edit_distance import DamerauLevenshtein, Levenshtein
+# Shared with AutoCorrection.tokenize, so that both strip the same characters
+from utils.auto_correction.constants import SPECIAL_CHARS
 
 class EditDistance:
     choices = ["DamerauLevenshtein", "Levenshtein"]
@@ -87,10 +87,7 @@ class MainWindow(QMainWindow, Customization):
             self.algorithm_selected = True
         
         solver = self.features[0].algorithms[idx]()
-        self.corrector = AutoCorrection(
-            dict_path=self.dict_path,
-            bigram_path=self.bigram_path,
-            solver=solver)
+        self.corrector.set_solver(solver)
     
     def detect_typo(self, word: str, word_prev: str = None) -> Tuple[str, bool]:
         """Detecting typos and returning alternative word."""
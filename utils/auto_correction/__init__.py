@@ -1 +1,5 @@
-from .autocorrection import AutoCorrection
\ No newline at end of file
+from .asynchronous import AsyncCorrection
+from .autocorrection import AutoCorrection
+from .cache import CorrectionCache
+from .lexicon import Lexicon
+from .parallel import ParallelCorrection
\ No newline at end of file
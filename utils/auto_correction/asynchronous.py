@@ -0,0 +1,127 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Tuple, Union
+from .autocorrection import AutoCorrection
+
+class AsyncCorrection:
+    """
+    Asyncio front-end of AutoCorrection, so that the event loop is never blocked
+    by a dictionary scan.
+
+    Requests arriving within batch_delay seconds of each other are collected into
+    one batch and corrected by AutoCorrection.correct_batch in the executor.
+    Identical requests in flight share one computation. A batch only deduplicates
+    the requests - the same word after previous words that change no score is
+    searched once, see AutoCorrection.correct_batch, but each distinct word is still
+    scanned on its own with AutoCorrection.get_fixed_word. There is no single vectorized
+    scan, as the bounded scalar scan measured faster on the dictionary buckets
+    than computing the rows of all the candidates at once.
+
+    AutoCorrection keeps state in its solver and cache, so the default executor
+    has a single thread. Use a ParallelCorrection-like process pool of your own
+    to spread batches over several cores.
+
+    Args:
+        corrector:          the corrector to run (AutoCorrection)
+        executor:           where batches run, a single-thread pool if None (Executor)
+        batch_delay:        how long a batch waits for more requests, in seconds (float)
+        max_batch:          the number of requests that flushes a batch at once (int)
+
+    ```python3
+    corrector = AsyncCorrection(AutoCorrection("./data/dictionary.json", "./data/bigram_dictionary.json", Levenshtein()))
+    word, score = await corrector.acorrect("I", "liek")
+    await corrector.aclose()
+    ```
+    """
+    def __init__(self, corrector: AutoCorrection, executor: Executor = None, batch_delay: float = 0.001, max_batch: int = 256):
+        self.corrector = corrector
+        # Only an executor created here is shut down by self.close
+        self.owns_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+
+        # Futures of the requests in flight, and the requests waiting for the next batch
+        self.in_flight = {}
+        self.queue = []
+        self.flush_handle = None
+
+    async def acorrect(self, *args) -> Tuple[str, Union[int, float]]:
+        """The same as AutoCorrection.__call__ with one or two words, but awaitable."""
+        if len(args) not in (1, 2):
+            raise ValueError("Expected one or two inputs but received {} inputs".format(len(args)))
+        if len(args) == 2:
+            key = (args[0].lower(), args[1].lower())
+        else:
+            key = (None, args[0].lower())
+
+        future = self.in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self.in_flight[key] = future
+            self.queue.append(key)
+            if len(self.queue) >= self.max_batch:
+                self.flush()
+            elif self.flush_handle is None:
+                self.flush_handle = loop.call_later(self.batch_delay, self.flush)
+
+        # Shielded, so that a cancelled request does not cancel the others sharing the future
+        return await asyncio.shield(future)
+
+    def flush(self) -> None:
+        """Sending the waiting requests to the executor as one batch."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if not self.queue:
+            return
+        keys, self.queue = self.queue, []
+
+        loop = asyncio.get_running_loop()
+        try:
+            batch = loop.run_in_executor(self.executor, self.corrector.correct_batch, keys)
+        except Exception as exception:
+            # For instance, an executor already shut down - the requests must not wait forever
+            self.fail(keys, exception)
+            return
+        batch.add_done_callback(lambda done: self.resolve(keys, done))
+
+    def resolve(self, keys: List[Tuple[Union[str, None], str]], done: asyncio.Future) -> None:
+        if done.cancelled():
+            self.fail(keys, None)
+            return
+        exception = done.exception()
+        if exception is not None:
+            self.fail(keys, exception)
+            return
+        fixed: Dict = done.result()
+        for key in keys:
+            future = self.in_flight.pop(key)
+            if not future.done():
+                future.set_result(fixed[key])
+
+    def fail(self, keys: List[Tuple[Union[str, None], str]], exception: Union[BaseException, None]) -> None:
+        """Failing the requests of a batch with the exception, or cancelling them if it is None."""
+        for key in keys:
+            future = self.in_flight.pop(key)
+            if future.done():
+                continue
+            if exception is None:
+                future.cancel()
+            else:
+                future.set_exception(exception)
+
+    def close(self) -> None:
+        """Shutting down the executor, if it was created by this instance, once the running batches finish."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if self.owns_executor:
+            self.executor.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        """Sending the waiting requests, and self.close without blocking the event loop."""
+        self.flush()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
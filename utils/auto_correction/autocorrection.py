@@ -1,18 +1,50 @@
-import json
-from .constants import REPLACE
-from typing import Tuple, List, Dict, Union
+import heapq
+import math
+import os
+from .cache import CorrectionCache
+from .constants import REPLACE, SPECIAL_CHARS_TABLE
+from .lexicon import Lexicon
+from ..edit_distance import AutomatonIndex, BKTree, QGramIndex, SymSpell, Trie, Dumbest, Hamming, Levenshtein, DamerauLevenshtein
+from typing import Tuple, List, Dict, Union, Iterable, Iterator, Mapping
 import sys
 
+# Indexes over the whole dictionary that can replace the bucket scan
+INDEXES = {
+    "bktree": BKTree,
+    "symspell": SymSpell,
+    "qgram": QGramIndex,
+    "trie": Trie,
+    "automaton": AutomatonIndex,
+}
+
+# Solvers whose distances are never lower than the difference of the word lengths
+LENGTH_BOUNDED = (Dumbest, Levenshtein, DamerauLevenshtein)
+
+# Solvers with integer distances, which the scans can cut off at an integer max_distance
+INTEGER_DISTANCES = (Dumbest, Hamming, Levenshtein, DamerauLevenshtein)
+
 class AutoCorrection:
-    def __init__(self, dict_path: str, bigram_path: str, solver) -> None:
+    def __init__(self, dict_path: str = None, bigram_path: str = None, solver = None, 
+                 search: str = "buckets", index_path: str = None, lexicon: Lexicon = None,
+                 cache_size: int = 100_000, cache_memory: int = 64 * 2 ** 20) -> None:
         """Simplest autocorrection application combined with bigrams
         When initiailized, the function expects one or two inputs as words 
         in order.
 
         Args:
             dict_path:              the filepath to json file of 40,000 English words dictionary (str)
-            bigram_path:            the filepath to json file of bigram dictionary (str)
-            solver:                 any edit distance algorithm from utils.edit_distance (Levenshtein, Dumbest, DamerauLevenshtein)
+            bigram_path:            the filepath to json file of bigram dictionary (str).
+                                    Both paths may point to a binary store compiled by store.compile_store instead.
+            solver:                 any edit distance algorithm from utils.edit_distance (Levenshtein, Dumbest, DamerauLevenshtein).
+                                    Only its distance method is called, so no subproblem map is built per candidate.
+            search:                 "buckets" to scan the dictionary lists narrowed down by the first letters, or
+                                    the name of an index in INDEXES built over the whole dictionary, such as "bktree" (str)
+            index_path (optional):  where an index with save and load methods, such as "symspell", is loaded from,
+                                    or saved to after it is built if nothing is found there yet (str)
+            lexicon (optional):     an already loaded Lexicon used instead of the paths (Lexicon).
+                                    Lexicons are cached per paths anyway, so the files are parsed only once.
+            cache_size:             the largest number of corrections kept in the LRU cache, 0 to disable it (int)
+            cache_memory:           the largest estimated memory of the cached corrections in bytes (int)
         
         A sentence: I liek playing video games.
 
@@ -28,18 +60,31 @@ class AutoCorrection:
         # Two words used. The first word "I" help the 
         # the corrector to provide correction better.
         print(corrector("I", "liek"))
+
+        # Another algorithm without reloading the dictionary
+        corrector.set_solver(Levenshtein())
         ``` 
         """
         self.bigram_path = bigram_path
         self.dict_path = dict_path
 
-        bigram = self.load_bigram()
-        dictionary = self.load_dictionary()
+        if lexicon is None:
+            if dict_path is None or bigram_path is None:
+                raise ValueError("Expected either dict_path and bigram_path or lexicon")
+            lexicon = Lexicon.load(dict_path=dict_path, bigram_path=bigram_path)
 
-        self.bigram = bigram
-        self.dictionary = dictionary
+        self.lexicon = lexicon
+        self.bigram = lexicon.bigram
+        self.dictionary = lexicon.dictionary
         self.solver = solver
 
+        self.search = search
+        self.index_path = index_path
+        self.index = self.build_index()
+
+        # Corrections keyed by (solver, word_1, word_2), see self.get_fixed_word
+        self.cache = CorrectionCache(max_size=cache_size, max_memory=cache_memory)
+
     def __call__(self, *args) -> Tuple[str, float]:
         """Running autocorrection with one or two words only."""
         if len(args) > 2:
@@ -55,39 +100,155 @@ class AutoCorrection:
             word_2 = args[0].lower()
         return self.get_fixed_word(word_2, word_1)
 
-    def load_bigram(self) -> Dict[
-                            str, 
-                            Dict[str, int]
-                            ]:
-        """Loading bigrams"""
-        with open(self.bigram_path) as f:
-            bigram = json.load(f)
-        return bigram
-    
-    def load_dictionary(self) -> Dict[str, List[str]]:
-        """Loading 40,000 English words dictionary"""
-        with open(self.dict_path) as f:
-            dictionary = json.load(f)
-        return dictionary
-    
+    def correct_text(self, text: str) -> List[Tuple[str, Union[int, float]]]:
+        """
+        Correcting all the words of a text. Each word is corrected with the previous 
+        word of the text, as typed, for bigrams.
+
+        Returns:
+            Fixed words paired with their scores, in order.
+        """
+        tokens = self.tokenize(text)
+        fixed = self.correct_batch(zip([None] + tokens[:-1], tokens))
+        return [fixed[pair] for pair in zip([None] + tokens[:-1], tokens)]
+
+    def correct_stream(self, lines: Iterable[str], batch_size: int = 1000) -> Iterator[List[Tuple[str, Union[int, float]]]]:
+        """
+        Correcting lines lazily, batch_size lines at a time, so that memory stays bounded
+        for corpora of any size. Words repeated within a batch are corrected once.
+        Bigrams do not cross line boundaries.
+
+        Args:
+            lines:              lines of text, such as an opened file (Iterable[str])
+            batch_size:         the number of lines corrected together (int)
+        Yields:
+            For each line, fixed words paired with their scores, in order.
+        """
+        batch = []
+        for line in lines:
+            batch.append(self.tokenize(line))
+            if len(batch) == batch_size:
+                yield from self.__correct_lines(batch)
+                batch = []
+        if batch:
+            yield from self.__correct_lines(batch)
+
+    def __correct_lines(self, lines: List[List[str]]) -> Iterator[List[Tuple[str, Union[int, float]]]]:
+        pairs = [list(zip([None] + tokens[:-1], tokens)) for tokens in lines]
+        fixed = self.correct_batch(pair for pairs_line in pairs for pair in pairs_line)
+        for pairs_line in pairs:
+            yield [fixed[pair] for pair in pairs_line]
+
+    def correct_batch(self, pairs: Iterable[Tuple[Union[str, None], str]]) -> Dict[
+                                                                            Tuple[Union[str, None], str], 
+                                                                            Tuple[str, Union[int, float]]
+                                                                            ]:
+        """
+        Correcting (word_1, word_2) pairs of lowercase words, where word_1 is None
+        if there is no previous word. Repeated pairs are corrected once, and known
+        words never reach the search, see self.get_fixed_word.
+
+        A word_1 that changes no score, see self.is_neutral, is dropped from its pair,
+        so all the pairs of such words with the same word_2 share one search.
+        Only the score becomes a float, as the distance divided by the frequency of 1.
+
+        Returns:
+            The unique pairs paired with the fixed words and their scores.
+        """
+        fixed = dict.fromkeys(pairs)
+        neutral = {}
+        alone = {}
+        for word_1, word_2 in fixed:
+            if word_1 is not None:
+                if word_1 not in neutral:
+                    neutral[word_1] = self.is_neutral(word_1)
+                if not neutral[word_1]:
+                    fixed[(word_1, word_2)] = self.get_fixed_word(word_2, word_1)
+                    continue
+            if word_2 not in alone:
+                alone[word_2] = self.get_fixed_word(word_2)
+            word_found, score = alone[word_2]
+            fixed[(word_1, word_2)] = (word_found, score if word_1 is None or score == -1 else score / 1)
+        return fixed
+
+    def is_neutral(self, word_1: str) -> bool:
+        """
+        Whether word_1 as the previous word changes no score. The scans of the dictionary lists
+        divide distances by the frequencies of the bigrams, and 1 divides nothing. The index
+        compares the words following word_1 before the others, so it must have none of them.
+        """
+        if self.index is not None:
+            return len(self.get_successors(word_1)) == 0
+        return self.lexicon.get_max_frequency(word_1) == 1
+
+    def tokenize(self, text: str) -> List[str]:
+        """Splitting a text into lowercase words without special characters."""
+        tokens = [token.translate(SPECIAL_CHARS_TABLE).lower() for token in text.split()]
+        return [token for token in tokens if len(token) > 0]
+
+    def set_solver(self, solver) -> None:
+        """
+        Swapping the edit distance algorithm without reloading the lexicon.
+        An index built around distances of the old solver, such as a BK-tree, 
+        is rebuilt for the new one, or loaded again from index_path.
+
+        If the index rejects the solver, such as a Trie with Jaro, ValueError is raised
+        and the corrector keeps the old solver, the index and the cache untouched.
+        """
+        if hasattr(self.index, "set_solver"):
+            self.index.set_solver(solver)
+        else:
+            self.index = self.build_index(solver)
+        self.solver = solver
+        self.invalidate_cache()
+
+    def set_lexicon(self, lexicon: Lexicon) -> None:
+        """Swapping the lexicon, which invalidates the cache and rebuilds the index."""
+        self.lexicon = lexicon
+        self.bigram = lexicon.bigram
+        self.dictionary = lexicon.dictionary
+        self.index = self.build_index()
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """Dropping all the cached corrections."""
+        self.cache.clear()
+
+    def build_index(self, solver = None):
+        """
+        Building the index chosen by self.search around the solver, self.solver if None,
+        or None for the bucket scan.
+        """
+        if solver is None:
+            solver = self.solver
+        if self.search == "buckets":
+            return None
+        if self.search not in INDEXES:
+            raise ValueError("Unknown search {}, expected buckets or one of {}".format(self.search, list(INDEXES)))
+        index_class = INDEXES[self.search]
+        if self.index_path is not None and not hasattr(index_class, "load"):
+            raise ValueError("Index {} cannot be saved to {}".format(self.search, self.index_path))
+        if self.index_path is not None and os.path.exists(self.index_path):
+            return index_class.load(self.index_path, solver)
+
+        index = index_class(self.lexicon.get_words(), solver)
+        if self.index_path is not None:
+            index.save(self.index_path)
+        return index
+
+    def get_successors(self, word_1: str) -> Mapping[str, int]:
+        """All the words following word_1 in bigrams, paired with the bigram frequencies."""
+        return self.lexicon.get_successors(word_1)
+
     def search_bigrams(self, word_1: str, word_2: str) -> int:
         """
         Searching for bigrams
 
         Returns:
                     Frequency of a bigram or 
-                    0 if no bigram found in dictionary.
-        """
-        key_1 = word_1[0] + word_2[0]
-        if key_1 in self.bigram:
-            key_2 = "{} {}".format(word_1, word_2)
-            if key_2 in self.bigram[key_1]:
-                bigram_frequency = self.bigram[key_1][key_2]
-                return bigram_frequency
-            else:
-                return 1
-        else:
-            return 1
+                    1 if no bigram found in dictionary.
+        """
+        return self.lexicon.get_frequency(word_1, word_2)
 
     def get_fixed_word(self, word_2: str, word_1: str = None) -> Tuple[
                                                                     str, 
@@ -102,10 +263,29 @@ class AutoCorrection:
         Returns:
             A fixed word and a evaluated score.
         """
-        if word_1 is not None:
-            return self.__get_fixed_word_with_bigram(word_1=word_1, word_2=word_2)
+        # A known word is its own best correction, with the score of 0,
+        # as long as the solver measures no distance between equal words.
+        # 0 divided by any bigram frequency is 0.0, so no bigram is looked up.
+        if word_2 in self.lexicon and self.solver.distance(word_2, word_2) == 0:
+            return word_2, (0 if word_1 is None else 0.0)
+
+        # The solver object is a part of the key, so swapping it never hits stale entries
+        key = (self.solver, word_1, word_2)
+        fixed = self.cache.get(key)
+        if fixed is not None:
+            return fixed
+
+        if self.index is not None:
+            fixed = self.__get_fixed_word_from_index(word_2=word_2, word_1=word_1)
+        elif isinstance(self.solver, LENGTH_BOUNDED):
+            fixed = self.__get_fixed_word_by_length(word_2=word_2, word_1=word_1)
+        elif word_1 is not None:
+            fixed = self.__get_fixed_word_with_bigram(word_1=word_1, word_2=word_2)
         else:
-            return self.__get_fixed_word_without_bigram(word=word_2)
+            fixed = self.__get_fixed_word_without_bigram(word=word_2)
+
+        self.cache.put(key, fixed)
+        return fixed
         
     def __get_fixed_word_with_bigram(self, word_2: str, word_1: str) -> Tuple[str, float]:
             """
@@ -132,16 +312,23 @@ class AutoCorrection:
             # and minimize the score.
             score_min = 1e10
 
+            # Words following word_1 paired with bigram frequencies, fetched once for the whole scan
+            successors = self.get_successors(word_1)
+
             for char in chars:
                 # (Not all of them) Words are compared with 
                 # (potentially) mistyped word
                 for word_dict in self.dictionary[char]:
 
-                    # edit distance
-                    distance = self.solver(word_2, word_dict)
+                    # frequency of bigrams, 1 if no bigram found
+                    frequency = successors.get(word_dict, 1)
 
-                    # frequency of bigrams
-                    frequency = self.search_bigrams(word_1, word_dict)
+                    # edit distance, cut off once the score cannot beat score_min,
+                    # that is, once distance >= score_min * frequency.
+                    max_distance = self.get_max_distance(score_min * frequency, word_found)
+                    distance = self.get_distance(word_2, word_dict, max_distance)
+                    if max_distance is not None and distance > max_distance:
+                        continue
                     
                     score = distance / frequency
                     if score_min > score:
@@ -178,8 +365,11 @@ class AutoCorrection:
                 # (potentially) mistyped word
                 for word_dict in self.dictionary[char]:
 
-                    # edit distance
-                    distance = self.solver(word, word_dict)
+                    # edit distance, cut off once it cannot beat score_min
+                    max_distance = self.get_max_distance(score_min, word_found)
+                    distance = self.get_distance(word, word_dict, max_distance)
+                    if max_distance is not None and distance > max_distance:
+                        continue
 
                     score = distance
                     if score_min > score:
@@ -193,6 +383,197 @@ class AutoCorrection:
             else:
                 return word_found, score_min
             
+    def __get_fixed_word_by_length(self, word_2: str, word_1: str = None) -> Tuple[str, Union[int, float]]:
+            """
+            The same search as self.__get_fixed_word_with_bigram and self.__get_fixed_word_without_bigram,
+            for solvers whose distance is at least the difference of lengths.
+
+            The dictionary lists are visited by word length, in the order of the increasing
+            gap between the lengths, and the scan stops once the gap alone gives a score
+            worse than the best one, with no distances computed for the rest of the lists.
+            With bigrams, the gap is divided by the highest frequency of the words following
+            word_1. Ties are broken by the position of the words in the lists, as in the scan
+            of the whole lists.
+            """
+            groups = [self.lexicon.get_length_groups(char) for char in self.narrow_down(word_2)]
+            max_gap = max((abs(length - len(word_2)) for group in groups for length in group), default=-1)
+            max_frequency = 1 if word_1 is None else self.lexicon.get_max_frequency(word_1)
+            successors = {} if word_1 is None else self.get_successors(word_1)
+
+            # The best alternative word, its (letter, position) to break ties, and its score
+            # kept as the distance and the frequency, so that scores are compared exactly
+            word_found = ""
+            order_found = None
+            distance_found = 0
+            frequency_found = 1
+
+            for gap in range(max_gap + 1):
+                if word_found != "" and gap * frequency_found > distance_found * max_frequency:
+                    break
+                for length in dict.fromkeys((len(word_2) - gap, len(word_2) + gap)):
+                    for char_idx, group in enumerate(groups):
+                        for position, word_dict in group.get(length, ()):
+                            frequency = successors.get(word_dict, 1)
+
+                            # distance / frequency must be lower than the best score, 
+                            # or equal to it for a word earlier in the lists
+                            max_distance = None
+                            if word_found != "":
+                                max_distance, remainder = divmod(distance_found * frequency, frequency_found)
+                                if remainder == 0 and (char_idx, position) > order_found:
+                                    max_distance -= 1
+                                # The distance is never lower than the gap, so no need to compute it
+                                if gap > max_distance:
+                                    continue
+                            distance = self.get_distance(word_2, word_dict, max_distance)
+                            if max_distance is not None and distance > max_distance:
+                                continue
+
+                            word_found = word_dict
+                            order_found = (char_idx, position)
+                            distance_found = distance
+                            frequency_found = frequency
+
+            if word_found == "":
+                # Return the input word, if no alternative found
+                # -1 indicates no alternative word.
+                return word_2, -1
+            else:
+                return word_found, (distance_found if word_1 is None else distance_found / frequency_found)
+
+    def __get_fixed_word_from_index(self, word_2: str, word_1: str = None) -> Tuple[str, Union[int, float]]:
+            """
+            The same scores as the bucket scan, but over the whole dictionary through self.index.
+
+            A word that never follows word_1 has the frequency of 1, so its score is just
+            its distance, and the nearest of them is found by the index. Only the words
+            that do follow word_1 are compared one by one.
+            """
+            word_found = ""
+            score_min = 1e10
+
+            if word_1 is not None:
+                for word_dict, frequency in self.get_successors(word_1).items():
+                    if word_dict not in self.index:
+                        continue
+                    max_distance = self.get_max_distance(score_min * frequency, word_found)
+                    distance = self.get_distance(word_2, word_dict, max_distance)
+                    if max_distance is not None and distance > max_distance:
+                        continue
+
+                    score = distance / frequency
+                    if score_min > score:
+                        score_min = score
+                        word_found = word_dict
+
+            max_distance = self.get_max_distance(score_min, word_found)
+            nearest = self.index.nearest(word_2, 1, max_distance=max_distance)
+            if len(nearest) > 0:
+                word_dict, distance = nearest[0]
+                score = distance if word_1 is None else distance / self.search_bigrams(word_1, word_dict)
+                if score_min > score:
+                    score_min = score
+                    word_found = word_dict
+
+            if word_found == "":
+                # Return the input word, if no alternative found
+                # -1 indicates no alternative word.
+                return word_2, -1
+            else:
+                return word_found, score_min
+
+    def suggest(self, word: str, k: int = 5, prev: str = None) -> List[Tuple[str, Union[int, float]]]:
+        """
+        The k best corrections of a word, scored the same way as by self.__call__.
+        Ties are broken by the order of the search, so the first suggestion is 
+        the correction returned by self.__call__.
+
+        A bounded heap keeps the k best candidates found so far, and the score of the
+        worst of them is passed to the solver as a cut-off, so candidates that cannot
+        make it into the list are abandoned early.
+
+        Args:
+            word:                   a potentially mistyped word (str)
+            k:                      the number of suggestions (int)
+            prev (optional):        the previous word, for bigrams (str)
+        Returns:
+            Up to k words paired with their scores, the best first.
+
+        ```python3
+        corrector.suggest("liek", k=3, prev="I")
+        ```
+        """
+        word = word.lower()
+        prev = None if prev is None else prev.lower()
+        if k <= 0:
+            return []
+
+        # Entries are (-score, -order, word), so the worst candidate is at heap[0]
+        heap = []
+        successors = {} if prev is None else self.get_successors(prev)
+        if self.index is None:
+            candidates = (
+                (word_dict, successors.get(word_dict, 1))
+                for char in self.narrow_down(word)
+                for word_dict in self.dictionary[char]
+                )
+        else:
+            successors = {word_dict: frequency for word_dict, frequency in successors.items() if word_dict in self.index}
+            candidates = successors.items()
+
+        order = 0
+        for order, (word_dict, frequency) in enumerate(candidates, start=1):
+            max_distance = self.get_suggestion_max_distance(heap, k, frequency)
+            distance = self.get_distance(word, word_dict, max_distance)
+            if max_distance is not None and distance > max_distance:
+                continue
+            self.push_suggestion(heap, k, word_dict, distance if prev is None else distance / frequency, order)
+
+        if self.index is not None:
+            # Successors come back from the index scored by distance alone, so they are skipped
+            max_distance = self.get_suggestion_max_distance(heap, k, 1)
+            nearest = self.index.nearest(word, k + len(successors), max_distance=max_distance)
+            for order, (word_dict, distance) in enumerate(nearest, start=order + 1):
+                if word_dict in successors:
+                    continue
+                score = distance if prev is None else distance / self.search_bigrams(prev, word_dict)
+                self.push_suggestion(heap, k, word_dict, score, order)
+
+        return [(word_dict, -score) for score, _, word_dict in sorted(heap, reverse=True)]
+
+    def get_suggestion_max_distance(self, heap: List[Tuple], k: int, frequency: int) -> Union[int, None]:
+        """
+        The cut-off of a candidate with the bigram frequency, which must score below 
+        the worst of the k suggestions found so far. None, while fewer than k are found.
+        """
+        if len(heap) < k or not isinstance(self.solver, INTEGER_DISTANCES):
+            return None
+        return math.ceil(-heap[0][0] * frequency) - 1
+
+    def push_suggestion(self, heap: List[Tuple], k: int, word_dict: str, score: Union[int, float], order: int) -> None:
+        """Adding a candidate to the heap of suggestions, if it beats the worst of them."""
+        if len(heap) < k:
+            heapq.heappush(heap, (-score, -order, word_dict))
+        elif score < -heap[0][0]:
+            heapq.heapreplace(heap, (-score, -order, word_dict))
+
+    def get_max_distance(self, distance_limit: float, word_found: str) -> Union[int, None]:
+        """
+        The largest distance a candidate may have to stay strictly below distance_limit,
+        passed to the solver as a cut-off. None, if no word is found yet, or if 
+        the distances of the solver are not integers, such as the scores of Jaro, 
+        since a distance of 1.5 is below the limit of 2.0 but above its cut-off of 1.
+        """
+        if word_found == "" or not isinstance(self.solver, INTEGER_DISTANCES):
+            return None
+        return math.ceil(distance_limit) - 1
+
+    def get_distance(self, word_1: str, word_2: str, max_distance: int = None) -> Union[int, float]:
+        """The distance by the solver, with max_distance passed only as a cut-off, see self.get_max_distance."""
+        if max_distance is None:
+            return self.solver.distance(word_1, word_2)
+        return self.solver.distance(word_1, word_2, max_distance=max_distance)
+
     def narrow_down(self, word):
         """
         Narrown down options to search the dictionary faster 
@@ -203,16 +584,20 @@ class AutoCorrection:
         as a dictionary of letters.
         """
         if len(word) == 1:
-            return word
+            return word if word in self.dictionary else ()
         
         char_0 = word[0]
         char_1 = word[1]
         chars = (
             [char_0, char_1] + 
-            REPLACE[char_0] + 
-            REPLACE[char_1]
+            REPLACE.get(char_0, []) + 
+            REPLACE.get(char_1, [])
             )
-        return tuple(set(chars))
+
+        # Duplicates are dropped in order rather than through a set, so that ties are broken
+        # the same way in every process regardless of hash randomization.
+        # Digits and other characters have no lists in the dictionary.
+        return tuple(char for char in dict.fromkeys(chars) if char in self.dictionary)
 
 if __name__ == "__main__":
     corrector = AutoCorrection(
@@ -0,0 +1,69 @@
+import sys
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple, Union
+
+# Rough size of an entry besides its strings - the key and value tuples and the linked list node
+ENTRY_OVERHEAD = 200
+
+class CorrectionCache:
+    """
+    Least recently used cache of corrections, bounded both by the number of entries
+    and by an estimate of the memory they take. The least recently used entries
+    are evicted first once either of the limits is exceeded.
+
+    Args:
+        max_size:           the largest number of entries (int)
+        max_memory:         the largest estimated memory of entries in bytes (int)
+    """
+    def __init__(self, max_size: int = 100_000, max_memory: int = 64 * 2 ** 20):
+        self.max_size = max_size
+        self.max_memory = max_memory
+
+        self.entries = OrderedDict()
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: Hashable) -> Union[Tuple[str, Union[int, float]], None]:
+        """The cached correction, or None if the key is not found."""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value[0]
+
+    def put(self, key: Hashable, correction: Tuple[str, Union[int, float]]) -> None:
+        if self.max_size <= 0:
+            return
+        if key in self.entries:
+            self.memory -= self.entries.pop(key)[1]
+
+        size = ENTRY_OVERHEAD + sum(sys.getsizeof(item) for item in key if isinstance(item, str))
+        size += sys.getsizeof(correction[0])
+        self.entries[key] = (correction, size)
+        self.memory += size
+
+        while len(self.entries) > self.max_size or self.memory > self.max_memory:
+            _, (_, size_evicted) = self.entries.popitem(last=False)
+            self.memory -= size_evicted
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Invalidating all the entries, for instance after the lexicon changes. Counters are kept."""
+        self.entries.clear()
+        self.memory = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self.entries),
+            "memory": self.memory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -40,5 +40,25 @@ for i in range(1, len(keyboard_lower) - 1):
         keyboard_lower[i + 1]
     ]
 
+# Characters stripped from tokens of a text, by AutoCorrection.tokenize and the GUI -
+# ASCII punctuation except apostrophes
+SPECIAL_CHARS = []
+for i in range(33, 48):
+    SPECIAL_CHARS.append(chr(i))
+
+for i in range(58, 65):
+    SPECIAL_CHARS.append(chr(i))
+    
+for i in range(91, 97):
+    SPECIAL_CHARS.append(chr(i))
+
+for i in range(123, 127):
+    SPECIAL_CHARS.append(chr(i))
+
+SPECIAL_CHARS.remove("'")
+
+# The same characters as a table for str.translate
+SPECIAL_CHARS_TABLE = {ord(char): None for char in SPECIAL_CHARS}
+
 if __name__ == "__main__":
     print(REPLACE)
\ No newline at end of file
@@ -0,0 +1,137 @@
+import json
+import os
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+from .store import is_store, open_store
+
+# Successors of the words that start no bigram
+EMPTY = MappingProxyType({})
+
+class Lexicon:
+    """
+    Read-only dictionary and bigrams shared by any number of AutoCorrection objects.
+    Lexicon.load parses the files once per pair of paths and returns the same
+    object afterwards, so swapping solvers or creating new correctors costs no I/O.
+
+    Args:
+        dictionary:             letters paired with the lists of words starting with them
+        bigram:                 two-letter keys paired with {"word_1 word_2": frequency}
+
+    ```python3
+    lexicon = Lexicon.load("./data/dictionary.json", "./data/bigram_dictionary.json")
+    corrector_1 = AutoCorrection(solver=Levenshtein(), lexicon=lexicon)
+    corrector_2 = AutoCorrection(solver=DamerauLevenshtein(), lexicon=lexicon)
+    ```
+    """
+    # Lexicons loaded so far, keyed by the absolute paths
+    cache = {}
+
+    def __init__(self, dictionary: Mapping[str, List[str]], bigram: Mapping[str, Mapping[str, int]]):
+        self.dictionary = dictionary
+        self.bigram = bigram
+
+        # Bigrams reindexed as word_1 -> {word_2: frequency}, so that the successors of a word
+        # are one lookup away. Binary stores already keep the bigrams grouped by the first word.
+        self.successors = None if hasattr(bigram, "get_successors") else self.build_successors(bigram)
+
+        # Membership set of the dictionary words, built on the first lookup
+        self.members = None
+
+        # Dictionary lists grouped by word length, built per letter on the first lookup
+        self.length_groups = {}
+
+        # The highest successor frequencies of the dictionary words looked up so far
+        self.max_frequencies = {}
+
+    def __contains__(self, word: str) -> bool:
+        if self.members is None:
+            self.members = frozenset(self.get_words())
+        return word in self.members
+
+    @classmethod
+    def load(cls, dict_path: str, bigram_path: str) -> "Lexicon":
+        """
+        Loading the lexicon from JSON files, or from binary stores compiled by store.compile_store,
+        which are memory-mapped. The same object is returned for the same paths.
+        """
+        key = (os.path.abspath(dict_path), os.path.abspath(bigram_path))
+        if key not in cls.cache:
+            cls.cache[key] = cls(
+                dictionary=cls.load_dictionary(dict_path),
+                bigram=cls.load_bigram(bigram_path)
+                )
+        return cls.cache[key]
+
+    @staticmethod
+    def load_bigram(bigram_path: str) -> Mapping[str, Mapping[str, int]]:
+        """Loading bigrams, memory-mapped if bigram_path is a binary store from store.py"""
+        if is_store(bigram_path):
+            return open_store(bigram_path).bigram
+        with open(bigram_path) as f:
+            bigram = json.load(f)
+        return MappingProxyType({key_1: MappingProxyType(bigrams) for key_1, bigrams in bigram.items()})
+
+    @staticmethod
+    def load_dictionary(dict_path: str) -> Mapping[str, List[str]]:
+        """
+        Loading 40,000 English words dictionary, memory-mapped if dict_path is a binary store from store.py.
+        Duplicates within the lists are dropped, keeping the first occurrence.
+        """
+        if is_store(dict_path):
+            return open_store(dict_path).dictionary
+        with open(dict_path) as f:
+            dictionary = json.load(f)
+        return MappingProxyType({char: tuple(dict.fromkeys(words)) for char, words in dictionary.items()})
+
+    def get_words(self) -> Tuple[str]:
+        """All the words of the dictionary without duplicates, in order."""
+        return tuple(dict.fromkeys(word for words in self.dictionary.values() for word in words))
+
+    def get_length_groups(self, char: str) -> Dict[int, Tuple[Tuple[int, str]]]:
+        """
+        The dictionary list of a letter grouped by word length. Each word is paired
+        with its position in the list, so that a scan visiting the groups out of order
+        can still break ties the same way as a scan of the whole list.
+        """
+        if char not in self.length_groups:
+            groups = {}
+            for position, word in enumerate(self.dictionary[char]):
+                groups.setdefault(len(word), []).append((position, word))
+            self.length_groups[char] = MappingProxyType({length: tuple(group) for length, group in groups.items()})
+        return self.length_groups[char]
+
+    @staticmethod
+    def build_successors(bigram: Mapping[str, Mapping[str, int]]) -> Mapping[str, Mapping[str, int]]:
+        """Regrouping the bigrams "word_1 word_2" of the two-letter keys by word_1."""
+        successors = {}
+        for bigrams in bigram.values():
+            for key_2, frequency in bigrams.items():
+                word_1, _, word_2 = key_2.partition(" ")
+                successors.setdefault(word_1, {})[word_2] = frequency
+        return MappingProxyType({word_1: MappingProxyType(words) for word_1, words in successors.items()})
+
+    def get_frequency(self, word_1: str, word_2: str) -> int:
+        """
+        Frequency of a bigram or
+        1 if no bigram found in dictionary.
+        """
+        # A store finds one bigram by binary search, without decoding all the successors of word_1
+        if self.successors is None:
+            return self.bigram.get_frequency(word_1, word_2) or 1
+        return self.successors.get(word_1, EMPTY).get(word_2, 1)
+
+    def get_max_frequency(self, word_1: str) -> int:
+        """The highest frequency of the bigrams starting with word_1, or 1 if there are none."""
+        if word_1 in self.max_frequencies:
+            return self.max_frequencies[word_1]
+        max_frequency = max(1, max(self.get_successors(word_1).values(), default=1))
+        # Only dictionary words are kept, so that typos never grow the table
+        if word_1 in self:
+            self.max_frequencies[word_1] = max_frequency
+        return max_frequency
+
+    def get_successors(self, word_1: str) -> Mapping[str, int]:
+        """All the words following word_1 in bigrams, paired with the bigram frequencies."""
+        if self.successors is None:
+            return self.bigram.get_successors(word_1)
+        return self.successors.get(word_1, EMPTY)
@@ -0,0 +1,113 @@
+import multiprocessing
+from collections import deque
+from typing import Iterable, Iterator, List, Tuple, Union
+from .autocorrection import AutoCorrection
+
+# The corrector of a worker process, inherited from the parent on fork or built by init_worker
+worker_corrector = None
+
+def init_worker(dict_path: str, bigram_path: str, solver, search: str, index_path: str,
+                cache_size: int, cache_memory: int) -> None:
+    """
+    Building the corrector once per worker, when the workers are not forked.
+    The lexicon is loaded from the paths, so a binary store is memory-mapped
+    and its pages are shared between the workers, and the cache is bounded as in the parent.
+    """
+    global worker_corrector
+    worker_corrector = AutoCorrection(
+        dict_path=dict_path,
+        bigram_path=bigram_path,
+        solver=solver,
+        search=search,
+        index_path=index_path,
+        cache_size=cache_size,
+        cache_memory=cache_memory
+        )
+
+def correct_chunk(lines: List[str]) -> List[List[Tuple[str, Union[int, float]]]]:
+    return list(worker_corrector.correct_stream(lines, batch_size=len(lines)))
+
+class ParallelCorrection:
+    """
+    Correcting large corpora with a pool of processes, each running
+    AutoCorrection.correct_stream on chunks of lines.
+
+    With the fork start method (the default where available), the workers inherit
+    the corrector with its lexicon and index as read-only, copy-on-write memory,
+    so nothing is pickled but the lines and the results. Otherwise, each worker
+    builds its own corrector from dict_path and bigram_path once.
+
+    Args:
+        corrector:          the corrector to run (AutoCorrection)
+        processes:          the number of worker processes, all the cores if None (int)
+        chunk_size:         the number of lines sent to a worker at a time (int)
+        start_method:       "fork", "spawn" or "forkserver", see multiprocessing (str)
+
+    ```python3
+    corrector = AutoCorrection("./data/dictionary.json", "./data/bigram_dictionary.json", DamerauLevenshtein())
+    with open("corpus.txt") as f:
+        for words in ParallelCorrection(corrector, processes=8).correct_stream(f):
+            print(" ".join(word for word, _ in words))
+    ```
+    """
+    def __init__(self, corrector: AutoCorrection, processes: int = None, chunk_size: int = 1000, start_method: str = None):
+        self.corrector = corrector
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        if start_method is None:
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        self.start_method = start_method
+
+    def correct_stream(self, lines: Iterable[str]) -> Iterator[List[Tuple[str, Union[int, float]]]]:
+        """
+        Correcting lines in parallel. The results are yielded in the order of the lines,
+        and only a couple of chunks per process are in flight at a time, so memory
+        stays bounded for inputs of any size.
+
+        Yields:
+            For each line, fixed words paired with their scores, in order.
+        """
+        global worker_corrector
+        context = multiprocessing.get_context(self.start_method)
+        if self.start_method == "fork":
+            worker_corrector = self.corrector
+            pool = context.Pool(self.processes)
+        else:
+            if self.corrector.dict_path is None or self.corrector.bigram_path is None:
+                raise ValueError("Start method {} needs a corrector built from dict_path and bigram_path".format(self.start_method))
+            pool = context.Pool(
+                self.processes,
+                initializer=init_worker,
+                initargs=(
+                    self.corrector.dict_path,
+                    self.corrector.bigram_path,
+                    self.corrector.solver,
+                    self.corrector.search,
+                    self.corrector.index_path,
+                    self.corrector.cache.max_size,
+                    self.corrector.cache.max_memory
+                    )
+                )
+
+        try:
+            with pool:
+                pending = deque()
+                for chunk in self.get_chunks(lines):
+                    pending.append(pool.apply_async(correct_chunk, (chunk,)))
+                    if len(pending) >= 2 * self.processes:
+                        yield from pending.popleft().get()
+                while pending:
+                    yield from pending.popleft().get()
+        finally:
+            # The corrector must not outlive the pool through the global of this process
+            worker_corrector = None
+
+    def get_chunks(self, lines: Iterable[str]) -> Iterator[List[str]]:
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
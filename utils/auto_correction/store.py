@@ -0,0 +1,249 @@
+"""
+Compact binary store of the dictionary and the bigrams.
+
+compile_store turns dictionary.json and bigram_dictionary.json into a single file
+of flat arrays - a sorted table of all the words (UTF-8 bytes plus offsets), the
+dictionary lists as word ids, and the bigrams as successor ids and frequencies
+grouped by the first word. open_store memory-maps the file, so the arrays are
+read zero-copy and several processes share the same pages.
+
+The file starts with MAGIC, the length of a JSON header and the header itself,
+which describes the arrays following it.
+
+```bash
+python -m utils.auto_correction.store data/dictionary.json data/bigram_dictionary.json data/lexicon.bin
+```
+"""
+import bisect
+import json
+import mmap
+import sys
+import numpy as np
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from typing import Dict, Tuple
+
+MAGIC = b"STRSIM01"
+
+def compile_store(dict_path: str, bigram_path: str, store_path: str) -> None:
+    """Compiling the JSON dictionary and bigrams into a binary store at store_path."""
+    with open(dict_path) as f:
+        dictionary = json.load(f)
+    with open(bigram_path) as f:
+        bigram = json.load(f)
+
+    pairs = [
+        (key_1, *key_2.split(" "), frequency)
+        for key_1, bigrams in bigram.items()
+        for key_2, frequency in bigrams.items()
+        ]
+    words = set(word for words_bucket in dictionary.values() for word in words_bucket)
+    words.update(word_1 for _, word_1, _, _ in pairs)
+    words.update(word_2 for _, _, word_2, _ in pairs)
+    vocabulary = sorted(words)
+    ids = {word: idx for idx, word in enumerate(vocabulary)}
+
+    encoded = [word.encode() for word in vocabulary]
+    arrays = {}
+    arrays["vocabulary"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    arrays["vocabulary_offsets"] = np.cumsum([0] + [len(word) for word in encoded], dtype=np.int64)
+
+    # Dictionary lists keep their order, without duplicates
+    dictionary = {bucket: list(dict.fromkeys(words_bucket)) for bucket, words_bucket in dictionary.items()}
+    buckets = list(dictionary)
+    arrays["bucket_words"] = np.array(
+        [ids[word] for bucket in buckets for word in dictionary[bucket]], dtype=np.int32)
+    arrays["bucket_offsets"] = np.cumsum([0] + [len(dictionary[bucket]) for bucket in buckets], dtype=np.int64)
+
+    # Bigrams sorted by the first and then the second word, as successors grouped by the first word
+    entries = sorted((ids[word_1], ids[word_2], frequency) for _, word_1, word_2, frequency in pairs)
+    firsts = np.array([entry[0] for entry in entries], dtype=np.int64)
+    arrays["successor_words"] = np.array([entry[1] for entry in entries], dtype=np.int32)
+    arrays["successor_frequencies"] = np.array([entry[2] for entry in entries], dtype=np.int32)
+    arrays["successor_offsets"] = np.searchsorted(firsts, np.arange(len(vocabulary) + 1)).astype(np.int64)
+
+    header = {"buckets": buckets, "bigram_keys": list(bigram), "arrays": {}}
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = [offset, array.dtype.str, len(array)]
+        offset += array.nbytes
+        offset += -offset % 8
+    header_bytes = json.dumps(header).encode()
+
+    with open(store_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        f.write(b"\0" * (-f.tell() % 8))
+        start = f.tell()
+        for name, array in arrays.items():
+            f.seek(start + header["arrays"][name][0])
+            f.write(array.tobytes())
+
+def is_store(path: str) -> bool:
+    """Checking if the file at path is a binary store rather than JSON."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+@lru_cache(maxsize=None)
+def open_store(path: str) -> "LexiconStore":
+    """Memory-mapping the store at path, once per path."""
+    return LexiconStore(path)
+
+class LexiconStore:
+    """
+    Read-only view of a binary store. self.dictionary and self.bigram behave
+    like the nested dictionaries loaded from the JSON files, but decode words
+    from the memory-mapped arrays on access.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not a binary store".format(path))
+
+        header_length = int.from_bytes(self.buffer[len(MAGIC):len(MAGIC) + 8], "little")
+        header_end = len(MAGIC) + 8 + header_length
+        header = json.loads(self.buffer[len(MAGIC) + 8:header_end])
+        start = header_end + (-header_end % 8)
+        for name, (offset, dtype, count) in header["arrays"].items():
+            setattr(self, name, np.frombuffer(self.buffer, dtype=dtype, count=count, offset=start + offset))
+
+        self.buckets = header["buckets"]
+        self.bigram_keys = header["bigram_keys"]
+        self.words = Vocabulary(self)
+        self.dictionary = StoreDictionary(self)
+        self.bigram = StoreBigram(self)
+
+    def get_word(self, idx: int) -> str:
+        return bytes(self.vocabulary[self.vocabulary_offsets[idx]:self.vocabulary_offsets[idx + 1]]).decode()
+
+    def get_id(self, word: str) -> int:
+        """Binary search in the sorted word table, -1 if the word is not found."""
+        idx = bisect.bisect_left(self.words, word)
+        if idx < len(self.words) and self.words[idx] == word:
+            return idx
+        return -1
+
+    def get_frequency(self, word_1: str, word_2: str) -> int:
+        """Frequency of the bigram, 0 if it is not found."""
+        id_1 = self.get_id(word_1)
+        id_2 = self.get_id(word_2)
+        if id_1 == -1 or id_2 == -1:
+            return 0
+        start = self.successor_offsets[id_1]
+        end = self.successor_offsets[id_1 + 1]
+        position = start + np.searchsorted(self.successor_words[start:end], id_2)
+        if position < end and self.successor_words[position] == id_2:
+            return int(self.successor_frequencies[position])
+        return 0
+
+    def get_successors(self, word_1: str) -> Dict[str, int]:
+        """All the words following word_1, paired with the bigram frequencies."""
+        id_1 = self.get_id(word_1)
+        if id_1 == -1:
+            return {}
+        start = self.successor_offsets[id_1]
+        end = self.successor_offsets[id_1 + 1]
+        return {
+            self.get_word(id_2): int(frequency)
+            for id_2, frequency in zip(self.successor_words[start:end], self.successor_frequencies[start:end])
+            }
+
+class Vocabulary(Sequence):
+    """Sorted words of a store, decoded one by one."""
+    def __init__(self, store: LexiconStore):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store.vocabulary_offsets) - 1
+
+    def __getitem__(self, idx: int) -> str:
+        return self.store.get_word(idx)
+
+class StoreDictionary(Mapping):
+    """Letters paired with the dictionary lists, decoded once per letter on first access."""
+    def __init__(self, store: LexiconStore):
+        self.store = store
+        self.positions = {bucket: idx for idx, bucket in enumerate(store.buckets)}
+        self.decoded = {}
+
+    def __getitem__(self, bucket: str) -> Tuple[str]:
+        if bucket not in self.decoded:
+            idx = self.positions[bucket]
+            ids = self.store.bucket_words[self.store.bucket_offsets[idx]:self.store.bucket_offsets[idx + 1]]
+            self.decoded[bucket] = tuple(dict.fromkeys(self.store.get_word(word_id) for word_id in ids))
+        return self.decoded[bucket]
+
+    def __iter__(self):
+        return iter(self.store.buckets)
+
+    def __len__(self):
+        return len(self.store.buckets)
+
+class StoreBigram(Mapping):
+    """Two-letter keys paired with BigramGroup, as in bigram_dictionary.json."""
+    def __init__(self, store: LexiconStore):
+        self.store = store
+        self.keys_set = set(store.bigram_keys)
+
+    def __getitem__(self, key_1: str) -> "BigramGroup":
+        if key_1 not in self.keys_set:
+            raise KeyError(key_1)
+        return BigramGroup(self.store, key_1)
+
+    def __contains__(self, key_1) -> bool:
+        return key_1 in self.keys_set
+
+    def __iter__(self):
+        return iter(self.store.bigram_keys)
+
+    def __len__(self):
+        return len(self.store.bigram_keys)
+
+    def get_successors(self, word_1: str) -> Dict[str, int]:
+        return self.store.get_successors(word_1)
+
+    def get_frequency(self, word_1: str, word_2: str) -> int:
+        return self.store.get_frequency(word_1, word_2)
+
+class BigramGroup(Mapping):
+    """Bigrams "word_1 word_2" of the two-letter key word_1[0] + word_2[0], paired with frequencies."""
+    def __init__(self, store: LexiconStore, key_1: str):
+        self.store = store
+        self.key_1 = key_1
+
+    def __getitem__(self, key_2: str) -> int:
+        word_1, _, word_2 = key_2.partition(" ")
+        frequency = 0
+        if word_1[:1] + word_2[:1] == self.key_1:
+            frequency = self.store.get_frequency(word_1, word_2)
+        if frequency == 0:
+            raise KeyError(key_2)
+        return frequency
+
+    def __contains__(self, key_2) -> bool:
+        try:
+            self[key_2]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        # Scanning the words starting with the first letter of the key, rarely needed
+        words = self.store.words
+        start = bisect.bisect_left(words, self.key_1[0])
+        for id_1 in range(start, len(words)):
+            word_1 = words[id_1]
+            if not word_1.startswith(self.key_1[0]):
+                break
+            for word_2 in self.store.get_successors(word_1):
+                if word_2.startswith(self.key_1[1:]):
+                    yield "{} {}".format(word_1, word_2)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+if __name__ == "__main__":
+    compile_store(*sys.argv[1:4])
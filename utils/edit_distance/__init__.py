@@ -1 +1,11 @@
 from .algorithms import Dumbest, Hamming, Levenshtein, DamerauLevenshtein, NeedlemanWunsch, Jaro
+from .automaton import LevenshteinAutomaton, AutomatonIndex
+from .batch import PackedWords
+from .bktree import BKTree
+from .qgram import QGramIndex
+from .smith_waterman import SmithWaterman
+from .substitution import SubstitutionMatrix
+from .symspell import SymSpell
+from .trie import Trie
+from .pairwise import pairwise
+from .metrics import cer, wer, process_characters, process_words
\ No newline at end of file
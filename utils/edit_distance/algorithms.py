@@ -1,5 +1,8 @@
 import numpy as np
+from typing import List, Tuple
 from .frameworks import Distance, ScoredDistance
+from .dtypes import get_dtype
+from . import batch, bitparallel
         
 class Dumbest():
     """
@@ -18,6 +21,12 @@ class Dumbest():
         for i in range(self.word_1_len):
             count += (self.word_1[i] != self.word_2[i])
         return count + (self.word_2_len - i - 1)
+
+    def distance(self, word_1: str, word_2: str, max_distance: int = None):
+        count = self(word_1, word_2)
+        if max_distance is not None and count > max_distance:
+            return max_distance + 1
+        return count
         
     def update_words(self, word_1: str, word_2: str):
         self.word_1 = word_1
@@ -37,11 +46,105 @@ class DamerauLevenshtein(Distance):
     to determine the edit distance between two strings.
 
     The recursive matrix approach is used by self.step method.
+    When only the distance is needed, self.distance runs the bit-parallel engine
+    from bitparallel.py, and self.distance_rows rolls three rows of the same recurrence.
 
     For more details --> https://en.wikipedia.org/wiki/Damerau%E2%80%93Levenshtein_distance
     """
     def __init__(self):
-        pass
+        # Match vectors of the last word_1, reused while the same word is compared
+        self.peq_word = None
+        self.peq = None
+
+    def distance(self, word_1: str, word_2: str, max_distance: int = None) -> int:
+        """
+        The final value of the subproblem map, computed bit-parallel.
+        With max_distance, max_distance + 1 is returned as soon as it is exceeded.
+        """
+        if self.peq_word != word_1:
+            self.peq_word = word_1
+            self.peq = bitparallel.build_peq(word_1)
+        return bitparallel.damerau_levenshtein(word_1, word_2, max_distance=max_distance, peq=self.peq)
+
+    def distance_rows(self, word_1: str, word_2: str, max_distance: int = None) -> int:
+        """
+        The same recurrence as self.step, but only the row two steps back 
+        (for transpositions), the previous and the current rows are kept.
+
+        With max_distance, only the diagonal band of cells that can stay within it is filled
+        and max_distance + 1 is returned as soon as a whole row exceeds it.
+        """
+        width = len(word_1) + 1
+        height = len(word_2) + 1
+        if max_distance is None:
+            max_distance = max(width, height) - 1
+
+        # The distance is never lower than the difference of lengths
+        if abs(width - height) > max_distance:
+            return max_distance + 1
+
+        # Every cell is capped at bound, which stands for "beyond max_distance"
+        bound = max_distance + 1
+        before = None
+        previous = [min(j, bound) for j in range(width)]
+        previous_min = 0
+        for i in range(1, height):
+            char_2 = word_2[i - 1]
+            current = [bound] * width
+            current[0] = min(i, bound)
+            row_min = current[0]
+            for j in range(max(1, i - max_distance), min(width, i + bound)):
+                char_1 = word_1[j - 1]
+                value = min(
+                    previous[j] + 1,                                    # delete
+                    current[j - 1] + 1,                                 # insert
+                    previous[j - 1] + (char_1 != char_2),               # replace
+                    bound
+                )
+                if i > 1 and j > 1 and (
+                        char_1 == word_2[i - 2] and word_1[j - 2] == char_2
+                    ):
+                    value = min(value, before[j - 2] + (char_1 != char_2))   # transposition
+                current[j] = value
+                if value < row_min:
+                    row_min = value
+
+            # A transposition reaches two rows back, so both rows must exceed the bound
+            if row_min == bound == previous_min:
+                return bound
+            before, previous, previous_min = previous, current, row_min
+        return previous[-1]
+
+    def many(self, query: str, candidates) -> np.ndarray:
+        """
+        Distances from the query to each of the candidates, computed together.
+        See Levenshtein.many - transpositions additionally look two rows back.
+        """
+        packed = batch.pack(candidates)
+        query_codes = batch.encode(query)
+        columns = np.arange(packed.codes.shape[1] + 1)
+
+        before = None
+        previous = np.broadcast_to(columns, (len(packed), len(columns)))
+        for i in range(1, len(query_codes) + 1):
+            unequal = packed.codes != query_codes[i - 1]
+            current = np.empty_like(previous)
+            current[:, 0] = i
+            np.minimum(previous[:, 1:] + 1, previous[:, :-1] + unequal, out=current[:, 1:])
+            if i > 1:
+                transposed = (
+                    (packed.codes[:, 1:] == query_codes[i - 2]) 
+                    & 
+                    (packed.codes[:, :-1] == query_codes[i - 1])
+                    )
+                current[:, 2:] = np.where(
+                    transposed, 
+                    np.minimum(current[:, 2:], before[:, :-2] + unequal[:, 1:]), 
+                    current[:, 2:]
+                    )
+            current = np.minimum.accumulate(current - columns, axis=1) + columns
+            before, previous = previous, current
+        return previous[np.arange(len(packed)), packed.lengths]
 
     def run(self):
         for i in range(1, self.height):
@@ -73,7 +176,8 @@ class DamerauLevenshtein(Distance):
 
         self.width = len(word_1) + 1
         self.height = len(word_2) + 1
-        self.subproblem_map = np.zeros((self.height, self.width)).astype(np.uint8)
+        # No cell, nor a cell + 1 in self.step, exceeds the length of the longer word + 1
+        self.subproblem_map = np.zeros((self.height, self.width), dtype=get_dtype(max(self.width, self.height)))
 
         self.subproblem_map[0, :] = np.arange(0, self.width)
         self.subproblem_map[:, 0] = np.arange(0, self.height)
@@ -96,6 +200,30 @@ class Hamming(Distance):
         if len(word_1) != len(word_2):
             raise ValueError("word_1 {} and word_2 {} have no equal lengths".format(word_1, word_2))
 
+    def distance(self, word_1: str, word_2: str, max_distance: int = None) -> int:
+        """
+        Counting replacements without self.subproblem_map. 
+        With max_distance, counting stops as soon as it is exceeded.
+        """
+        self.check_lengths(word_1, word_2)
+        count = 0
+        for char_1, char_2 in zip(word_1, word_2):
+            if char_1 != char_2:
+                count += 1
+                if max_distance is not None and count > max_distance:
+                    return max_distance + 1
+        return count
+
+    def many(self, query: str, candidates) -> np.ndarray:
+        """Replacements between the query and each of the candidates, counted together."""
+        packed = batch.pack(candidates)
+        if len(packed) == 0:
+            return np.zeros(0, dtype=np.int64)
+        unequal = packed.lengths != len(query)
+        if unequal.any():
+            self.check_lengths(query, packed.words[unequal.argmax()])
+        return (packed.codes[:, :len(query)] != batch.encode(query)).sum(axis=1)
+
     def run(self):
         for i in range(1, self.dimension):
             self.step(i)
@@ -112,7 +240,7 @@ class Hamming(Distance):
         self.word_1 = word_1
         self.word_2 = word_2
         self.dimension = len(word_1) + 1
-        self.subproblem_map = np.zeros((1, self.dimension)).astype(np.uint8)
+        self.subproblem_map = np.zeros((1, self.dimension), dtype=get_dtype(self.dimension))
 
 class Jaro(ScoredDistance):
     """
@@ -171,6 +299,60 @@ class Jaro(ScoredDistance):
             j += 1
         return count_transposition
 
+    def many(self, query: str, candidates) -> np.ndarray:
+        """
+        Scores of the query against each of the candidates, computed together.
+
+        As in self.update_words, the shorter word of each pair looks for matches 
+        within the range of the longer one. Rows with no matches score 0.
+        """
+        packed = batch.pack(candidates)
+        query_codes = batch.encode(query)
+        count = len(packed)
+        width = max(packed.codes.shape[1], len(query_codes))
+        rows = np.arange(count)
+        positions = np.arange(width)
+
+        codes = np.full((count, width), batch.PAD, dtype=np.int64)
+        codes[:, :packed.codes.shape[1]] = packed.codes
+        query_row = np.full(width, batch.PAD, dtype=np.int64)
+        query_row[:len(query_codes)] = query_codes
+
+        # Padded cells are never compared, as positions are checked against the lengths
+        swapped = len(query_codes) > packed.lengths
+        short = np.where(swapped[:, None], codes, query_row)
+        long = np.where(swapped[:, None], query_row, codes)
+        short_len = np.where(swapped, packed.lengths, len(query_codes))
+        long_len = np.where(swapped, len(query_codes), packed.lengths)
+        match_range = long_len // 2 - 1
+
+        short_cond = np.zeros((count, width), dtype=bool)
+        long_cond = np.zeros((count, width), dtype=bool)
+        for i in range(width):
+            window = (
+                (positions >= i - match_range[:, None]) 
+                & (positions <= i + match_range[:, None]) 
+                & (positions < long_len[:, None])
+                )
+            found = window & ~long_cond & (long == short[:, i:i + 1]) & (i < short_len)[:, None]
+            has_match = found.any(axis=1)
+            long_cond[rows[has_match], found.argmax(axis=1)[has_match]] = True
+            short_cond[has_match, i] = True
+        match = short_cond.sum(axis=1)
+
+        # Matched characters of both words in order, compared pairwise
+        short_matched = np.take_along_axis(short, np.argsort(~short_cond, axis=1, kind="stable"), axis=1)
+        long_matched = np.take_along_axis(long, np.argsort(~long_cond, axis=1, kind="stable"), axis=1)
+        transposition = ((short_matched != long_matched) & (positions < match[:, None])).sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = (
+                match / short_len + 
+                match / long_len + 
+                (match - transposition / 2) / match
+            ) / 3
+        return np.where(match > 0, score, 0.0)
+
     def run(self):
         self.score = self.get_score()
 
@@ -197,13 +379,297 @@ class NeedlemanWunsch(Distance):
     that maximisizes the score, instead of minimizing the distance.
 
     The recursive matrix approach is used by self.step method.
+    self.distance keeps only two rows, and self.align recovers the alignment itself
+    in linear memory with Hirschberg's divide and conquer, so long sequences such as
+    real genes never need the whole subproblem map.
+
+    With gap_extend, gaps are affine (Gotoh) - the first character of a gap scores 
+    gap_penalty and every next one gap_extend. With band, only the cells within band 
+    of the diagonal are computed, in O(n * band) time and memory. In both modes the score
+    is computed row by row with NumPy and no subproblem map is built.
 
     For more details --> https://en.wikipedia.org/wiki/Needleman%E2%80%93Wunsch_algorithm
+                     --> https://en.wikipedia.org/wiki/Hirschberg%27s_algorithm
+                     --> https://doi.org/10.1016/0022-2836(82)90398-9 (Gotoh)
+
+    Args:
+        match_score:            the score of a pair of equal characters (int)
+        mismatch_score:         the score of a pair of different characters (int)
+        gap_penalty:            the score of a gap character, or of the first one with gap_extend (int)
+        gap_extend (optional):  the score of every next character of a gap, no lower than gap_penalty (int)
+        band (optional):        the largest distance of a cell from the diagonal, |i - j| <= band (int)
     """
-    def __init__(self, match_score: int = 1, mismatch_score: int = -1, gap_penalty: int = -1):
+    # Subproblems up to this number of cells are aligned with a whole map and a traceback
+    TRACEBACK_CELLS = 4096
+
+    def __init__(self, match_score: int = 1, mismatch_score: int = -1, gap_penalty: int = -1,
+                 gap_extend: int = None, band: int = None):
         self.match_score = match_score
         self.mismatch_score = mismatch_score
         self.gap_penalty = gap_penalty
+        self.gap_extend = gap_extend
+        self.band = band
+
+        # Opening a gap must cost at least as much as extending it, see self.get_affine
+        if gap_extend is not None and gap_extend < gap_penalty:
+            raise ValueError("gap_extend {} is lower than gap_penalty {}".format(gap_extend, gap_penalty))
+        if band is not None and band < 0:
+            raise ValueError("band {} is negative".format(band))
+
+    def __call__(self, word_1: str, word_2: str, max_distance: int = None):
+        """
+        The score of the words. Affine and banded modes have no subproblem map,
+        so the score is computed by self.distance.
+        """
+        if self.gap_extend is not None or self.band is not None:
+            return self.distance(word_1, word_2, max_distance=max_distance)
+        return super().__call__(word_1, word_2, max_distance=max_distance)
+
+    def get_dtype(self, length_1: int, length_2: int) -> type:
+        """
+        The narrowest signed dtype for the rows of two sequences. No cell exceeds the length
+        of both sequences times the largest score, and the running maximum of self.get_rows 
+        shifts the cells by up to as much again.
+        """
+        largest = max(abs(self.match_score), abs(self.mismatch_score), abs(self.gap_penalty))
+        return get_dtype(2 * (length_1 + length_2) * largest, signed=True)
+
+    def get_affine(self, codes_1: np.ndarray, codes_2: np.ndarray) -> int:
+        """
+        The score with affine gaps and/or within the band, one NumPy row operation per character of codes_2.
+
+        Three values are kept per cell - H, the best score, F, the best score ending with a gap
+        in codes_1 (coming from the row above), and E, the best score ending with a gap in codes_2
+        (coming from the left). As opening a gap costs at least as much as extending it,
+        E[j] = max(T[k] + gap_penalty + (j - k - 1) * gap_extend) over k < j, where T is 
+        the best score of the cell without E. It is a running maximum, as in self.get_rows.
+
+        Without band, the rows are indexed by the column j. With band, they only hold
+        the columns i - band <= j <= i + band, indexed by j - i + band, so the cell above 
+        moves one position to the right and the diagonal cell stays in place.
+        """
+        length_1, length_2 = len(codes_1), len(codes_2)
+        gap_open = self.gap_penalty
+        gap_extend = self.gap_penalty if self.gap_extend is None else self.gap_extend
+        if self.band is None:
+            width, shift = length_1 + 1, 0
+            columns = np.arange(width)
+        else:
+            if abs(length_1 - length_2) > self.band:
+                raise ValueError("band {} is narrower than the difference of lengths {}".format(
+                    self.band, abs(length_1 - length_2)))
+            width, shift = 2 * self.band + 1, 1
+            columns = np.arange(width) - self.band
+
+        # Cells outside the map or the band hold minus infinity, low enough to never win
+        # and still far from the limits of the dtype after the gaps are added to it
+        largest = max(abs(self.match_score), abs(self.mismatch_score), abs(gap_open), abs(gap_extend))
+        bound = (length_1 + length_2 + 1) * largest
+        dtype = get_dtype(8 * bound, signed=True)
+        infinity = dtype(-2 * bound)
+        extends = np.arange(width, dtype=dtype) * dtype(gap_extend)
+
+        # A padded code point past the end, so that columns outside the map can be gathered
+        codes = np.append(codes_1, batch.PAD)
+
+        # Row 0 - a leading gap in codes_2 up to the column j
+        j = columns
+        scores = np.where(j == 0, 0, gap_open + (j - 1) * gap_extend)
+        h = np.where((j >= 0) & (j <= length_1), scores, infinity).astype(dtype)
+        f = np.full(width, infinity, dtype=dtype)
+        for i, char in enumerate(codes_2.tolist(), start=1):
+            j = columns + i * shift
+            inside = (j >= 1) & (j <= length_1)
+            if shift:
+                h_up = np.append(h[1:], infinity)
+                f_up = np.append(f[1:], infinity)
+                h_diagonal = h
+            else:
+                h_up, f_up = h, f
+                h_diagonal = np.insert(h[:-1], 0, infinity)
+
+            f = np.maximum(f_up + dtype(gap_extend), h_up + dtype(gap_open))
+            substitution = np.where(codes[np.where(inside, j - 1, length_1)] == char, self.match_score, self.mismatch_score)
+            t = np.maximum(h_diagonal + substitution.astype(dtype), f)
+            t[~inside] = infinity
+
+            # The first column - a leading gap in codes_1
+            first = j == 0
+            t[first] = gap_open + (i - 1) * gap_extend
+            f[first] = t[first]
+
+            e = np.full(width, infinity, dtype=dtype)
+            e[1:] = (np.maximum.accumulate(t - extends)[:-1] + extends[1:] + dtype(gap_open - gap_extend))
+            h = np.maximum(t, e)
+            h[~(inside | first)] = infinity
+            f[~(inside | first)] = infinity
+
+        position = length_1 - length_2 * shift + (self.band if shift else 0)
+        return int(h[position])
+
+    def get_rows(self, codes_1: np.ndarray, codes_2: np.ndarray, keep: bool = False) -> np.ndarray:
+        """
+        The rows of the subproblem map of the code points codes_1 (columns) and codes_2 (rows),
+        one NumPy operation per row. Gaps along a row are resolved by a running maximum, 
+        as in self.many.
+
+        Returns:
+            The last row, or all of them if keep.
+        """
+        dtype = self.get_dtype(len(codes_1), len(codes_2))
+        gaps = np.arange(len(codes_1) + 1, dtype=dtype) * dtype(self.gap_penalty)
+
+        # Scores of each distinct character of codes_2 against all of codes_1, computed once
+        profile = {
+            char: np.where(codes_1 == char, self.match_score, self.mismatch_score).astype(dtype)
+            for char in np.unique(codes_2).tolist()
+            }
+
+        previous = gaps
+        rows = [previous]
+        for i, char in enumerate(codes_2.tolist(), start=1):
+            current = np.empty_like(previous)
+            current[0] = i * self.gap_penalty
+            np.maximum(previous[1:] + dtype(self.gap_penalty), previous[:-1] + profile[char], out=current[1:])
+            previous = np.maximum.accumulate(current - gaps) + gaps
+            if keep:
+                rows.append(previous)
+        return np.stack(rows) if keep else previous
+
+    def distance(self, word_1: str, word_2: str, max_distance: int = None) -> int:
+        """
+        The final value of the subproblem map, computed with two rows at a time.
+        With max_distance, max_distance + 1 is returned if the score exceeds it, as by Distance.distance.
+        """
+        if self.gap_extend is not None or self.band is not None:
+            score = self.get_affine(batch.encode(word_1), batch.encode(word_2))
+        else:
+            score = int(self.get_rows(batch.encode(word_1), batch.encode(word_2))[-1])
+        if max_distance is not None and score > max_distance:
+            return max_distance + 1
+        return score
+
+    def align(self, word_1: str, word_2: str) -> Tuple[int, str, str, str]:
+        """
+        The optimal global alignment in memory linear in the lengths of the words.
+
+        Returns:
+            The score, both words with "-" for gaps, and the CIGAR string of word_2
+            aligned to word_1 - "=" for matches, "X" for mismatches, "I" for characters
+            of word_2 only and "D" for characters of word_1 only.
+
+        ```python3
+        NeedlemanWunsch().align("GATTACA", "GCATGCA")   # (2, "G-ATTACA", "GCA-TGCA", "1=1I1=1D1=1X2=")
+        ```
+        """
+        if self.gap_extend is not None or self.band is not None:
+            raise ValueError("align supports linear gaps without band only")
+        operations = self.hirschberg(batch.encode(word_1), batch.encode(word_2))
+
+        aligned_1 = []
+        aligned_2 = []
+        cigar = []
+        score = 0
+        i = j = 0
+        for operation in operations:
+            if operation == "M":
+                operation = "=" if word_1[j] == word_2[i] else "X"
+                score += self.match_score if operation == "=" else self.mismatch_score
+                aligned_1.append(word_1[j])
+                aligned_2.append(word_2[i])
+                i += 1
+                j += 1
+            elif operation == "I":
+                score += self.gap_penalty
+                aligned_1.append("-")
+                aligned_2.append(word_2[i])
+                i += 1
+            else:
+                score += self.gap_penalty
+                aligned_1.append(word_1[j])
+                aligned_2.append("-")
+                j += 1
+            if cigar and cigar[-1][1] == operation:
+                cigar[-1][0] += 1
+            else:
+                cigar.append([1, operation])
+        return (
+            score, 
+            "".join(aligned_1), 
+            "".join(aligned_2), 
+            "".join("{}{}".format(count, operation) for count, operation in cigar)
+            )
+
+    def hirschberg(self, codes_1: np.ndarray, codes_2: np.ndarray) -> List[str]:
+        """
+        The operations of an optimal alignment - "M" for a pair of characters, "I" for 
+        a character of codes_2 against a gap and "D" for a character of codes_1 against a gap.
+
+        The rows codes_2 are split in half. The forward rows of the upper half and
+        the backward rows of the lower half meet at the column where the optimal path
+        crosses the middle, and both halves are aligned recursively. Small subproblems
+        are aligned with a traceback through their whole map.
+        """
+        if len(codes_2) == 0:
+            return ["D"] * len(codes_1)
+        if len(codes_1) == 0:
+            return ["I"] * len(codes_2)
+        if len(codes_2) == 1 or len(codes_1) * len(codes_2) <= self.TRACEBACK_CELLS:
+            return self.traceback(codes_1, codes_2)
+
+        middle = len(codes_2) // 2
+        forward = self.get_rows(codes_1, codes_2[:middle])
+        backward = self.get_rows(codes_1[::-1], codes_2[middle:][::-1])[::-1]
+        split = int(np.argmax(forward.astype(np.int64) + backward))
+        return (
+            self.hirschberg(codes_1[:split], codes_2[:middle]) + 
+            self.hirschberg(codes_1[split:], codes_2[middle:])
+            )
+
+    def traceback(self, codes_1: np.ndarray, codes_2: np.ndarray) -> List[str]:
+        """The operations of an optimal alignment, traced back through the whole subproblem map."""
+        rows = self.get_rows(codes_1, codes_2, keep=True)
+        operations = []
+        i, j = len(codes_2), len(codes_1)
+        while i > 0 or j > 0:
+            if i > 0 and j > 0 and rows[i, j] == rows[i - 1, j - 1] + (
+                        self.match_score if codes_1[j - 1] == codes_2[i - 1] else self.mismatch_score
+                ):
+                operations.append("M")
+                i -= 1
+                j -= 1
+            elif i > 0 and rows[i, j] == rows[i - 1, j] + self.gap_penalty:
+                operations.append("I")
+                i -= 1
+            else:
+                operations.append("D")
+                j -= 1
+        return operations[::-1]
+
+    def many(self, query: str, candidates) -> np.ndarray:
+        """
+        Scores of the query against each of the candidates, computed together.
+        See Levenshtein.many - gaps along a row are resolved by a running maximum.
+        Affine and banded scores are computed one candidate at a time.
+        """
+        if self.gap_extend is not None or self.band is not None:
+            return np.array([self.distance(query, candidate) for candidate in candidates])
+        packed = batch.pack(candidates)
+        columns = np.arange(packed.codes.shape[1] + 1)
+        gaps = columns * self.gap_penalty
+
+        previous = np.broadcast_to(gaps, (len(packed), len(columns)))
+        for i, char in enumerate(batch.encode(query), start=1):
+            current = np.empty_like(previous)
+            current[:, 0] = i * self.gap_penalty
+            np.maximum(
+                previous[:, 1:] + self.gap_penalty, 
+                previous[:, :-1] + np.where(packed.codes == char, self.match_score, self.mismatch_score), 
+                out=current[:, 1:]
+                )
+            current = np.maximum.accumulate(current - gaps, axis=1) + gaps
+            previous = current
+        return previous[np.arange(len(packed)), packed.lengths]
 
     def run(self):
         for i in range(1, self.height):
@@ -229,10 +695,11 @@ class NeedlemanWunsch(Distance):
 
         self.width = len(word_1) + 1
         self.height = len(word_2) + 1
-        self.subproblem_map = np.zeros((self.height, self.width)).astype(np.int8)
+        self.subproblem_map = np.zeros((self.height, self.width), dtype=self.get_dtype(len(word_1), len(word_2)))
 
-        self.subproblem_map[0, :] = -np.arange(0, self.width)
-        self.subproblem_map[:, 0] = -np.arange(0, self.height)
+        # Leading gaps cost gap_penalty each, as any other gap
+        self.subproblem_map[0, :] = np.arange(0, self.width) * self.gap_penalty
+        self.subproblem_map[:, 0] = np.arange(0, self.height) * self.gap_penalty
 
 class Levenshtein(Distance):
     """
@@ -240,11 +707,87 @@ class Levenshtein(Distance):
     to determine the edit distance between two strings.
 
     The recursive matrix approach is used by self.step method.
+    When only the distance is needed, self.distance runs the bit-parallel engine
+    from bitparallel.py, and self.distance_rows rolls two rows of the same recurrence.
 
     For more details --> https://en.wikipedia.org/wiki/Levenshtein_distance
     """
     def __init__(self):
-        pass
+        # Match vectors of the last word_1, reused while the same word is compared
+        self.peq_word = None
+        self.peq = None
+
+    def distance(self, word_1: str, word_2: str, max_distance: int = None) -> int:
+        """
+        The final value of the subproblem map, computed bit-parallel.
+        With max_distance, max_distance + 1 is returned as soon as it is exceeded.
+        """
+        if self.peq_word != word_1:
+            self.peq_word = word_1
+            self.peq = bitparallel.build_peq(word_1)
+        return bitparallel.levenshtein(word_1, word_2, max_distance=max_distance, peq=self.peq)
+
+    def distance_rows(self, word_1: str, word_2: str, max_distance: int = None) -> int:
+        """
+        The same recurrence as self.step, but only the previous and 
+        the current rows are kept as plain lists.
+
+        With max_distance, only the diagonal band of cells that can stay within it is filled
+        (Ukkonen's cut-off) and max_distance + 1 is returned as soon as a whole row exceeds it.
+        """
+        width = len(word_1) + 1
+        height = len(word_2) + 1
+        if max_distance is None:
+            max_distance = max(width, height) - 1
+
+        # The distance is never lower than the difference of lengths
+        if abs(width - height) > max_distance:
+            return max_distance + 1
+
+        # Every cell is capped at bound, which stands for "beyond max_distance"
+        bound = max_distance + 1
+        previous = [min(j, bound) for j in range(width)]
+        for i in range(1, height):
+            char_2 = word_2[i - 1]
+            current = [bound] * width
+            current[0] = min(i, bound)
+            row_min = current[0]
+            for j in range(max(1, i - max_distance), min(width, i + bound)):
+                value = min(
+                    previous[j] + 1,                                    # delete
+                    current[j - 1] + 1,                                 # insert
+                    previous[j - 1] + (word_1[j - 1] != char_2),        # replace
+                    bound
+                )
+                current[j] = value
+                if value < row_min:
+                    row_min = value
+            if row_min == bound:
+                return bound
+            previous = current
+        return previous[-1]
+
+    def many(self, query: str, candidates) -> np.ndarray:
+        """
+        Distances from the query to each of the candidates (List[str] or batch.PackedWords).
+
+        The candidates are packed into a padded code point matrix and the rows of 
+        all their subproblem maps are computed together, one NumPy row operation per 
+        character of the query. Insertions along a row are resolved by a running minimum, 
+        current[j] = min(current[k] + j - k) over k <= j. Cells past the end of shorter 
+        candidates are ignored when the last cell of each candidate is gathered.
+        """
+        packed = batch.pack(candidates)
+        columns = np.arange(packed.codes.shape[1] + 1)
+
+        previous = np.broadcast_to(columns, (len(packed), len(columns)))
+        for i, char in enumerate(batch.encode(query), start=1):
+            current = np.empty_like(previous)
+            current[:, 0] = i
+            np.minimum(previous[:, 1:] + 1, previous[:, :-1] + (packed.codes != char), out=current[:, 1:])
+            current = np.minimum.accumulate(current - columns, axis=1) + columns
+            previous = current
+        return previous[np.arange(len(packed)), packed.lengths]
 
     def run(self):
         for i in range(1, self.height):
@@ -265,7 +808,8 @@ class Levenshtein(Distance):
 
         self.width = len(word_1) + 1
         self.height = len(word_2) + 1
-        self.subproblem_map = np.zeros((self.height, self.width)).astype(np.uint8)
+        # No cell, nor a cell + 1 in self.step, exceeds the length of the longer word + 1
+        self.subproblem_map = np.zeros((self.height, self.width), dtype=get_dtype(max(self.width, self.height)))
 
         self.subproblem_map[0, :] = np.arange(0, self.width)
         self.subproblem_map[:, 0] = np.arange(0, self.height)
@@ -0,0 +1,224 @@
+"""
+Levenshtein automata for queries with a small fixed radius.
+
+LevenshteinAutomaton compiles a word into a deterministic automaton accepting all the
+strings within max_edit operations of it. A state is a row of the subproblem map with
+values capped at max_edit + 1, so there are finitely many of them. A character that is
+not found in the word changes a row the same way as any other such character, so they
+share transitions. States and transitions are built lazily and memoized, so a state
+reached by many dictionary prefixes is computed once.
+
+Intersected with a Trie or a sorted list of words, the automaton enumerates all the
+words within the radius, skipping every prefix from which no word can be accepted,
+without a subproblem map per word.
+
+For more details --> https://en.wikipedia.org/wiki/Levenshtein_automaton
+                 --> https://julesjacobs.com/2015/06/17/disqus-levenshtein-simple-and-fast.html
+
+```python3
+automaton = LevenshteinAutomaton("bottel", 2)
+automaton.match("bottle")                                   # 2
+automaton.intersect_sorted(["battle", "bottle", "little"])  # [("bottle", 2)]
+```
+"""
+import bisect
+from typing import Hashable, Iterable, List, Tuple
+from .algorithms import DamerauLevenshtein
+from .trie import Trie
+from .nearest import nearest_by_radius
+
+# Greater than any character, so that prefix + LAST comes after all the words starting with prefix
+LAST = chr(0x10FFFF)
+
+class LevenshteinAutomaton:
+    """
+    Deterministic automaton of the strings within max_edit operations of a word.
+
+    Args:
+        word:               the query word (str)
+        max_edit:           the radius of the query (int)
+        transpositions:     whether transpositions count as one operation, as in
+                            DamerauLevenshtein (optimal string alignment) (bool)
+    """
+    def __init__(self, word: str, max_edit: int, transpositions: bool = False):
+        self.word = word
+        self.max_edit = max_edit
+        self.transpositions = transpositions
+        self.chars = set(word)
+
+        # State ids index the lists below
+        self.ids = {}
+        self.states = []
+        self.transitions = []
+        self.distances = []
+        self.alive = []
+
+        bound = max_edit + 1
+        row = tuple(min(j, bound) for j in range(len(word) + 1))
+        # For transpositions, a state also holds the row before and the last character
+        self.start = self.get_id((row, (bound,) * len(row), None) if transpositions else row)
+
+    def get_id(self, state: tuple) -> int:
+        """The id of a state, added to the automaton if it is new."""
+        idx = self.ids.get(state)
+        if idx is None:
+            idx = len(self.states)
+            self.ids[state] = idx
+            self.states.append(state)
+            self.transitions.append({})
+            row = state[0] if self.transpositions else state
+            self.distances.append(row[-1])
+            # No accepted string can be reached once the rows exceed max_edit,
+            # and a transposition looks one more row back
+            alive = min(row) <= self.max_edit
+            if self.transpositions:
+                alive = alive or min(state[1]) <= self.max_edit
+            self.alive.append(alive)
+        return idx
+
+    def step(self, idx: int, char: str) -> int:
+        """The state reached from the state idx by the character."""
+        key = char if char in self.chars else None
+        transitions = self.transitions[idx]
+        if key in transitions:
+            return transitions[key]
+
+        state = self.states[idx]
+        if self.transpositions:
+            previous, before, char_previous = state
+        else:
+            previous, before, char_previous = state, None, None
+
+        bound = self.max_edit + 1
+        word = self.word
+        current = [min(previous[0] + 1, bound)]
+        for j in range(1, len(word) + 1):
+            char_1 = word[j - 1]
+            value = min(
+                previous[j] + 1,                                        # delete
+                current[j - 1] + 1,                                     # insert
+                previous[j - 1] + (char_1 != key),                      # replace
+                bound
+            )
+            if before is not None and j > 1 and char_1 == char_previous and word[j - 2] == key:
+                value = min(value, before[j - 2] + (char_1 != key))     # transposition
+            current.append(value)
+
+        current = tuple(current)
+        transitions[key] = self.get_id((current, previous, key) if self.transpositions else current)
+        return transitions[key]
+
+    def match(self, text: Iterable[Hashable]) -> int:
+        """The distance from the word to the text, or max_edit + 1 if it exceeds max_edit."""
+        idx = self.start
+        for char in text:
+            idx = self.step(idx, char)
+            if not self.alive[idx]:
+                return self.max_edit + 1
+        return self.distances[idx]
+
+    def intersect_trie(self, trie: Trie) -> List[Tuple[int, int, str]]:
+        """
+        All the words of the trie accepted by the automaton.
+
+        Returns:
+            (distance, insertion order, word) of the words found.
+        """
+        found = []
+        if trie.root[1] != -1 and self.distances[self.start] <= self.max_edit:
+            found.append((self.distances[self.start], trie.root[1], trie.words[trie.root[1]]))
+        stack = [(trie.root, self.start)]
+        while stack:
+            node, idx = stack.pop()
+            for char, child in node[0].items():
+                idx_child = self.step(idx, char)
+                if not self.alive[idx_child]:
+                    continue
+                if child[1] != -1 and self.distances[idx_child] <= self.max_edit:
+                    found.append((self.distances[idx_child], child[1], trie.words[child[1]]))
+                stack.append((child, idx_child))
+        return found
+
+    def intersect_sorted(self, words: List[str]) -> List[Tuple[str, int]]:
+        """
+        All the words of a sorted list accepted by the automaton, as (word, distance) pairs
+        in the order of the list. The states of the prefix shared with the previous word
+        are reused, and all the words starting with a rejected prefix are skipped by bisection.
+        """
+        found = []
+        # states[i] is the state after the first i characters of prefix
+        states = [self.start]
+        prefix = ""
+        position = 0
+        while position < len(words):
+            word = words[position]
+            common = 0
+            limit = min(len(prefix), len(word))
+            while common < limit and prefix[common] == word[common]:
+                common += 1
+            del states[common + 1:]
+
+            for char in word[common:]:
+                states.append(self.step(states[-1], char))
+                if not self.alive[states[-1]]:
+                    break
+            prefix = word[:len(states) - 1]
+
+            if not self.alive[states[-1]]:
+                position = bisect.bisect_left(words, prefix + LAST, position)
+                continue
+            if self.distances[states[-1]] <= self.max_edit:
+                found.append((word, self.distances[states[-1]]))
+            position += 1
+        return found
+
+class AutomatonIndex:
+    """
+    Trie of words searched with Levenshtein automata, one per query and radius.
+
+    Args:
+        words:          words to index, duplicates are skipped (Iterable[str])
+        solver:         Levenshtein or DamerauLevenshtein, only its type is used
+        max_edit:       the largest radius a query can have (int)
+
+    ```python3
+    index = AutomatonIndex(["bottle", "battle", "little"], Levenshtein(), max_edit=2)
+    index.query("bottel", 2)     # [("bottle", 2)]
+    ```
+    """
+    def __init__(self, words: Iterable[str], solver, max_edit: int = 2):
+        self.max_edit = max_edit
+        self.trie = Trie(words, solver)
+        self.set_solver(solver)
+
+    def __len__(self):
+        return len(self.trie)
+
+    def __contains__(self, word: str):
+        return word in self.trie
+
+    def set_solver(self, solver) -> None:
+        """The trie does not depend on the solver, only the automata do."""
+        self.trie.set_solver(solver)
+        self.solver = solver
+        self.transpositions = isinstance(solver, DamerauLevenshtein)
+
+    def query(self, word: str, radius: int) -> List[Tuple[str, int]]:
+        """
+        All the words within the radius from the word, as (word, distance) pairs
+        sorted by distance and then by insertion order.
+        """
+        if radius > self.max_edit:
+            raise ValueError("radius {} exceeds max_edit {} of the index".format(radius, self.max_edit))
+        automaton = LevenshteinAutomaton(word, radius, transpositions=self.transpositions)
+        return [(word_found, distance) for distance, _, word_found in sorted(automaton.intersect_trie(self.trie))]
+
+    def nearest(self, word: str, k: int = 1, max_distance: int = None) -> List[Tuple[str, int]]:
+        """
+        The k closest words to the word, as (word, distance) pairs sorted by distance
+        and then by insertion order. Words farther than max_edit are never found.
+        """
+        radius = self.max_edit if max_distance is None else min(max_distance, self.max_edit)
+
+        # Automata of small radiuses have few states, so they are tried first
+        return nearest_by_radius(lambda radius_current: self.query(word, radius_current), k, radius)
@@ -0,0 +1,45 @@
+"""
+Packing of words into padded code point matrices for the many methods,
+which compare one query against all the candidates at once with NumPy.
+"""
+import numpy as np
+from typing import List, Union
+
+# Padding never equals a code point, so padded cells never count as a match
+PAD = -1
+
+class PackedWords:
+    """
+    Candidates packed once and reused across queries, for instance
+    a dictionary bucket scanned for every typo.
+
+    Args:
+        words:          candidate words (List[str])
+    Attributes:
+        codes:          code points of the words, padded with PAD (np.ndarray of shape (len(words), max length))
+        lengths:        lengths of the words (np.ndarray)
+    """
+    def __init__(self, words: List[str]):
+        self.words = list(words)
+        self.lengths = np.fromiter(map(len, self.words), dtype=np.int64, count=len(self.words))
+        width = int(self.lengths.max()) if len(self.words) > 0 else 0
+
+        self.codes = np.full((len(self.words), width), PAD, dtype=np.int64)
+        filled = np.arange(width) < self.lengths[:, None]
+        self.codes[filled] = encode("".join(self.words))
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+def encode(word: str) -> np.ndarray:
+    """Code points of a word."""
+    return np.frombuffer(word.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+def pack(candidates: Union[List[str], PackedWords]) -> PackedWords:
+    """Packing candidates, unless they are already packed."""
+    if isinstance(candidates, PackedWords):
+        return candidates
+    return PackedWords(candidates)
@@ -0,0 +1,175 @@
+"""
+Bit-parallel engines for the distance-only calls of Levenshtein and DamerauLevenshtein.
+
+A column of the subproblem map is never stored as numbers. Instead, the vertical
+differences between neighbouring cells (+1, 0 or -1) are packed into two bit-vectors,
+one bit per character of the pattern, and a whole column is advanced with a handful of
+integer operations per character of the text.
+
+Python integers have arbitrary precision, so the same code handles patterns of
+any length - the interpreter processes long integers in machine-word digits,
+which is what the blocked multi-word variant of the algorithm does by hand.
+
+For more details --> https://doi.org/10.1145/316542.316550 (Myers)
+                 --> Hyyro, "A bit-vector algorithm for computing Levenshtein and Damerau edit distances" (2003)
+"""
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+def build_peq(pattern: Sequence[Hashable]) -> Dict[Hashable, int]:
+    """
+    Pattern match vectors - for each character, the bit i is set
+    if the character is found at the position i of the pattern.
+    """
+    peq = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    return peq
+
+def levenshtein(pattern: Sequence[Hashable], text: Sequence[Hashable],
+                max_distance: int = None, peq: Dict[Hashable, int] = None) -> int:
+    """
+    Myers' algorithm. The returned value equals the last cell of the Levenshtein subproblem map.
+
+    Args:
+        pattern:            the word packed into bit-vectors (str or a list of tokens)
+        text:               the word iterated character by character (str or a list of tokens)
+        max_distance:       if given, max_distance + 1 is returned as soon as
+                            the distance is known to exceed it (int)
+        peq:                match vectors of the pattern, if already built by build_peq
+    """
+    length = len(pattern)
+    text_length = len(text)
+    if max_distance is not None and abs(length - text_length) > max_distance:
+        return max_distance + 1
+    if length == 0:
+        return text_length
+    if peq is None:
+        peq = build_peq(pattern)
+
+    mask = (1 << length) - 1
+    last = 1 << (length - 1)
+
+    # All vertical differences are +1 in the first column
+    vp = mask
+    vn = 0
+    score = length
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+        x = eq | vn
+        d0 = ((((x & vp) + vp) & mask) ^ vp) | x
+        hp = vn | (~(d0 | vp) & mask)
+        hn = vp & d0
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+
+        # The first row grows by one in each column
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | (~(d0 | hp) & mask)
+        vn = hp & d0
+
+        # The remaining characters can lower the score by one at most each
+        if max_distance is not None and score - (text_length - j - 1) > max_distance:
+            return max_distance + 1
+
+    if max_distance is not None and score > max_distance:
+        return max_distance + 1
+    return score
+
+def levenshtein_vectors(pattern: Sequence[Hashable], text: Sequence[Hashable],
+                        peq: Dict[Hashable, int] = None) -> Tuple[int, List[int], List[int]]:
+    """
+    Myers' algorithm keeping the vertical differences of every column, so that
+    an alignment can be traced back without the subproblem map.
+
+    Returns:
+        The distance, and the vectors vp and vn after each character of the text -
+        the bit i of vp[j] (vn[j]) is set if the cell i + 1 of the column j + 1 is
+        one more (one less) than the cell i.
+    """
+    length = len(pattern)
+    if length == 0:
+        return len(text), [0] * len(text), [0] * len(text)
+    if peq is None:
+        peq = build_peq(pattern)
+
+    mask = (1 << length) - 1
+    last = 1 << (length - 1)
+
+    vp = mask
+    vn = 0
+    score = length
+    vps = []
+    vns = []
+    for char in text:
+        eq = peq.get(char, 0)
+        x = eq | vn
+        d0 = ((((x & vp) + vp) & mask) ^ vp) | x
+        hp = vn | (~(d0 | vp) & mask)
+        hn = vp & d0
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | (~(d0 | hp) & mask)
+        vn = hp & d0
+        vps.append(vp)
+        vns.append(vn)
+    return score, vps, vns
+
+def damerau_levenshtein(pattern: Sequence[Hashable], text: Sequence[Hashable],
+                        max_distance: int = None, peq: Dict[Hashable, int] = None) -> int:
+    """
+    Hyyro's extension of Myers' algorithm with adjacent transpositions. The returned value
+    equals the last cell of the DamerauLevenshtein subproblem map (optimal string alignment).
+
+    The arguments are the same as for the levenshtein function.
+    """
+    length = len(pattern)
+    text_length = len(text)
+    if max_distance is not None and abs(length - text_length) > max_distance:
+        return max_distance + 1
+    if length == 0:
+        return text_length
+    if peq is None:
+        peq = build_peq(pattern)
+
+    mask = (1 << length) - 1
+    last = 1 << (length - 1)
+
+    vp = mask
+    vn = 0
+    d0 = 0
+    eq_previous = 0
+    score = length
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+
+        # Cells reachable by a transposition of the current and the previous characters
+        transposition = (((~d0 & eq) << 1) & eq_previous) & mask
+        x = eq | vn
+        d0 = ((((x & vp) + vp) & mask) ^ vp) | x | transposition
+        hp = vn | (~(d0 | vp) & mask)
+        hn = vp & d0
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | (~(d0 | hp) & mask)
+        vn = hp & d0
+        eq_previous = eq
+
+        if max_distance is not None and score - (text_length - j - 1) > max_distance:
+            return max_distance + 1
+
+    if max_distance is not None and score > max_distance:
+        return max_distance + 1
+    return score
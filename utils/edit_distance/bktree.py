@@ -0,0 +1,121 @@
+import heapq
+from typing import Iterable, List, Tuple
+
+class BKTree:
+    """
+    Burkhard-Keller tree is a metric index over a collection of words. Each child
+    of a node is keyed by its distance to the node, so that the triangle inequality
+    restricts a search within a radius to the children keyed between
+    distance - radius and distance + radius.
+
+    The solver is expected to be a metric, such as Levenshtein. DamerauLevenshtein
+    (optimal string alignment) violates the triangle inequality in rare cases
+    of overlapping transpositions, where a matching word may be missed.
+
+    For more details --> https://en.wikipedia.org/wiki/BK-tree
+
+    Args:
+        words:          words to index, duplicates are skipped (Iterable[str])
+        solver:         any edit distance algorithm from utils.edit_distance with integer distances
+
+    ```python3
+    tree = BKTree(["bottle", "battle", "little"], Levenshtein())
+    tree.query("bottel", 2)     # [("bottle", 2)]
+    tree.nearest("bottel", 1)   # [("bottle", 2)]
+    ```
+    """
+    def __init__(self, words: Iterable[str], solver):
+        self.solver = solver
+
+        # A node is a list of [word, insertion order, {distance: child node}]
+        self.root = None
+        self.members = set()
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, word: str):
+        return word in self.members
+
+    def add(self, word: str) -> None:
+        if word in self.members:
+            return
+        node_new = [word, len(self.members), {}]
+        self.members.add(word)
+        if self.root is None:
+            self.root = node_new
+            return
+
+        node = self.root
+        while True:
+            distance = int(self.solver.distance(word, node[0]))
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = node_new
+                return
+            node = child
+
+    def get_distance(self, word: str, node: list, radius: float) -> int:
+        """
+        The distance from the word to the node, cut off where neither the node
+        nor any of its children can be within the radius any longer.
+        """
+        max_distance = radius + max(node[2], default=0)
+        if max_distance == float("inf"):
+            max_distance = None
+        return int(self.solver.distance(word, node[0], max_distance=max_distance))
+
+    def query(self, word: str, radius: int) -> List[Tuple[str, int]]:
+        """
+        All the words within the radius from the word, as (word, distance) pairs
+        sorted by distance and then by insertion order.
+        """
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = self.get_distance(word, node, radius)
+            if distance <= radius:
+                found.append((distance, node[1], node[0]))
+            for key, child in node[2].items():
+                if distance - radius <= key <= distance + radius:
+                    stack.append(child)
+        return [(word_found, distance) for distance, _, word_found in sorted(found)]
+
+    def nearest(self, word: str, k: int = 1, max_distance: int = None) -> List[Tuple[str, int]]:
+        """
+        The k closest words to the word, as (word, distance) pairs sorted by distance
+        and then by insertion order. The search radius shrinks to the distance
+        of the k-th closest word found so far.
+
+        Args:
+            word:               a query word (str)
+            k:                  the number of words to return (int)
+            max_distance:       if given, words farther than it are not returned (int)
+        """
+        # Max-heap of the k best as (-distance, -insertion order, word)
+        best = []
+        radius = float("inf") if max_distance is None else max_distance
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = self.get_distance(word, node, radius)
+            if distance <= radius:
+                item = (-distance, -node[1], node[0])
+                if len(best) < k:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+                if len(best) == k:
+                    radius = min(radius, -best[0][0])
+
+            # The children closest to the distance are the most promising, so they are popped first
+            children = [
+                (abs(key - distance), child) for key, child in node[2].items()
+                if distance - radius <= key <= distance + radius
+                ]
+            children.sort(key=lambda pair: pair[0], reverse=True)
+            stack.extend(child for _, child in children)
+        return [(word_found, -distance) for distance, _, word_found in sorted(best, reverse=True)]
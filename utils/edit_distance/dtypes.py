@@ -0,0 +1,19 @@
+"""
+Choosing the narrowest integer dtype that can hold the cells of a subproblem map.
+Narrow cells keep small maps cache-friendly, while long inputs get wider cells
+instead of silently wrapping around.
+"""
+import numpy as np
+
+UNSIGNED = (np.uint8, np.uint16, np.uint32, np.uint64)
+SIGNED = (np.int8, np.int16, np.int32, np.int64)
+
+def get_dtype(max_value: int, signed: bool = False) -> type:
+    """
+    The narrowest integer dtype holding every value within [-max_value, max_value] if signed,
+    or within [0, max_value] otherwise.
+    """
+    for dtype in (SIGNED if signed else UNSIGNED):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    raise OverflowError("No integer dtype holds {}".format(max_value))
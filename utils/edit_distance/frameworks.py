@@ -1,10 +1,39 @@
+import numpy as np
 
 class Distance():
-    def __call__(self, word_1: str, word_2: str):
+    def __call__(self, word_1: str, word_2: str, max_distance: int = None):
+        """
+        With max_distance, the computation is cut off as soon as the distance 
+        is known to exceed it, max_distance + 1 is returned in that case, and
+        self.subproblem_map is not built.
+        """
+        if max_distance is not None:
+            return self.distance(word_1, word_2, max_distance=max_distance)
+
         self.update_words(word_1=word_1, word_2=word_2)
         self.run()
         return self.subproblem_map[-1, -1]
 
+    def distance(self, word_1: str, word_2: str, max_distance: int = None):
+        """
+        Only the final value of the subproblem map, as returned by self.__call__.
+        Algorithms override it with an engine that keeps no more than 
+        the rows it needs, so self.subproblem_map is left untouched.
+        """
+        self.update_words(word_1=word_1, word_2=word_2)
+        self.run()
+        distance = self.subproblem_map[-1, -1]
+        if max_distance is not None and distance > max_distance:
+            return max_distance + 1
+        return distance
+
+    def many(self, query: str, candidates) -> np.ndarray:
+        """
+        Distances from the query to each of the candidates, in order.
+        Algorithms override it to process all the candidates together as NumPy arrays.
+        """
+        return np.array([self.distance(query, candidate) for candidate in candidates])
+
     def update_words(self, word_1: str, word_2: str):
         raise NotImplementedError()
 
@@ -17,8 +46,16 @@ class ScoredDistance():
         self.run()
         return self.score
 
+    def distance(self, word_1: str, word_2: str, max_distance: int = None):
+        """The score, as returned by self.__call__. Scores have no cut-off, so max_distance is ignored."""
+        return self(word_1, word_2)
+
+    def many(self, query: str, candidates) -> np.ndarray:
+        """Scores of the query against each of the candidates, in order."""
+        return np.array([self.distance(query, candidate) for candidate in candidates])
+
     def update_words(self, word_1: str, word_2: str):
         raise NotImplementedError()
 
     def run(self):
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
@@ -0,0 +1,158 @@
+"""
+Word and character error rates (WER and CER) of speech recognition or OCR outputs
+against their references, computed as jiwer computes them.
+
+The tokens of each pair are mapped to integer ids, and the hypothesis is aligned to
+the reference with the bit-parallel Levenshtein engine of bitparallel.py, keeping the
+vertical differences of each column to trace the alignment back. The common prefix and
+suffix of a pair are hits without any computation. The alignment gives the number of
+substitutions, deletions and insertions, with ties broken as by the editops of rapidfuzz,
+which jiwer uses. A corpus is split into chunks of pairs counted in a pool of processes,
+and the error rate is the sum of the errors over the sum of the reference lengths.
+
+For more details --> https://en.wikipedia.org/wiki/Word_error_rate
+                 --> https://github.com/jitsi/jiwer
+
+```python3
+wer("I like playing football games.", "I liek playing fotball games")     # 0.6
+process_words(["a b c", "d e"], ["a x c", "d"], processes=1)
+# {"wer": 0.4, "hits": 3, "substitutions": 1, "deletions": 1, "insertions": 0}
+```
+"""
+import multiprocessing
+import re
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple, Union
+from . import bitparallel
+
+# Runs of whitespace collapsed into a single space before splitting into words, as by jiwer
+SPACES = re.compile(r"\s\s+")
+
+def split_words(sentence: str) -> List[str]:
+    """Words of a sentence, as by the default transformation of jiwer.wer."""
+    return [word for word in SPACES.sub(" ", sentence).strip().split(" ") if len(word) > 0]
+
+def split_chars(sentence: str) -> List[str]:
+    """Characters of a sentence, spaces included, as by the default transformation of jiwer.cer."""
+    return list(sentence.strip())
+
+def get_ids(tokens: Sequence[Hashable], vocabulary: Dict[Hashable, int]) -> List[int]:
+    """Integer ids of the tokens, new tokens are added to the vocabulary."""
+    return [vocabulary.setdefault(token, len(vocabulary)) for token in tokens]
+
+def get_counts(reference: Sequence[int], hypothesis: Sequence[int]) -> Tuple[int, int, int, int]:
+    """
+    Hits, substitutions, deletions and insertions of a minimal alignment of the hypothesis to the reference.
+
+    The alignment is traced back from the last cell. A cell one more than the cell above
+    is reached by a deletion, otherwise a cell one less than the cell above on its left
+    is reached by an insertion, otherwise by a hit or a substitution.
+    """
+    # The common prefix and suffix are hits
+    start = 0
+    limit = min(len(reference), len(hypothesis))
+    while start < limit and reference[start] == hypothesis[start]:
+        start += 1
+    end_reference, end_hypothesis = len(reference), len(hypothesis)
+    while end_reference > start and end_hypothesis > start and reference[end_reference - 1] == hypothesis[end_hypothesis - 1]:
+        end_reference -= 1
+        end_hypothesis -= 1
+    hits = start + len(reference) - end_reference
+    reference = reference[start:end_reference]
+    hypothesis = hypothesis[start:end_hypothesis]
+
+    _, vps, vns = bitparallel.levenshtein_vectors(reference, hypothesis)
+    substitutions = deletions = insertions = 0
+    i, j = len(reference), len(hypothesis)
+    while i and j:
+        bit = 1 << (i - 1)
+        if vps[j - 1] & bit:
+            deletions += 1
+            i -= 1
+            continue
+        j -= 1
+        if j and vns[j - 1] & bit:
+            insertions += 1
+        else:
+            i -= 1
+            if reference[i] == hypothesis[j]:
+                hits += 1
+            else:
+                substitutions += 1
+    return hits, substitutions, deletions + i, insertions + j
+
+def count_chunk(arguments: Tuple[List[Tuple[str, str]], Callable[[str], List[str]]]) -> Tuple[int, int, int, int]:
+    """Hits, substitutions, deletions and insertions summed over a chunk of (reference, hypothesis) pairs."""
+    pairs, split = arguments
+    # Ids are only compared within a pair, so each chunk has a vocabulary of its own
+    vocabulary = {}
+    total = [0, 0, 0, 0]
+    for reference, hypothesis in pairs:
+        tokens = split(reference)
+        if len(tokens) == 0:
+            raise ValueError("one or more references are empty strings")
+        counts = get_counts(get_ids(tokens, vocabulary), get_ids(split(hypothesis), vocabulary))
+        for idx, count in enumerate(counts):
+            total[idx] += count
+    return tuple(total)
+
+def process(
+        references: Union[str, Sequence[str]],
+        hypotheses: Union[str, Sequence[str]],
+        split: Callable[[str], List[str]],
+        processes: int = None,
+        chunk: int = 10000
+        ) -> Dict[str, int]:
+    """
+    Hits, substitutions, deletions and insertions summed over all the pairs.
+
+    Args:
+        references:         a reference sentence or a list of them (str or Sequence[str])
+        hypotheses:         a hypothesis sentence or a list of them, one per reference (str or Sequence[str])
+        split:              splits a sentence into tokens, split_words or split_chars
+        processes:          the number of worker processes, all the cores if None (int)
+        chunk:              the number of pairs sent to a worker at once (int)
+    """
+    if isinstance(references, str):
+        references = [references]
+    if isinstance(hypotheses, str):
+        hypotheses = [hypotheses]
+    if len(references) != len(hypotheses):
+        raise ValueError("{} references do not match {} hypotheses".format(len(references), len(hypotheses)))
+
+    pairs = list(zip(references, hypotheses))
+    chunks = [(pairs[start:start + chunk], split) for start in range(0, len(pairs), chunk)]
+    processes = processes or multiprocessing.cpu_count()
+    if processes == 1 or len(chunks) <= 1:
+        results = map(count_chunk, chunks)
+        total = [sum(counts) for counts in zip((0, 0, 0, 0), *results)]
+    else:
+        if "fork" in multiprocessing.get_all_start_methods():
+            pool = multiprocessing.get_context("fork").Pool(processes)
+        else:
+            pool = multiprocessing.Pool(processes)
+        with pool:
+            total = [sum(counts) for counts in zip((0, 0, 0, 0), *pool.imap_unordered(count_chunk, chunks))]
+    return dict(zip(("hits", "substitutions", "deletions", "insertions"), total))
+
+def get_error_rate(counts: Dict[str, int]) -> float:
+    """Errors over the length of the references, (S + D + I) / (H + S + D)."""
+    errors = counts["substitutions"] + counts["deletions"] + counts["insertions"]
+    return errors / (counts["hits"] + counts["substitutions"] + counts["deletions"])
+
+def process_words(references, hypotheses, processes: int = None, chunk: int = 10000) -> Dict[str, Union[int, float]]:
+    """The counts of process over words, and the word error rate under "wer"."""
+    counts = process(references, hypotheses, split_words, processes=processes, chunk=chunk)
+    return {"wer": get_error_rate(counts), **counts}
+
+def process_characters(references, hypotheses, processes: int = None, chunk: int = 10000) -> Dict[str, Union[int, float]]:
+    """The counts of process over characters, and the character error rate under "cer"."""
+    counts = process(references, hypotheses, split_chars, processes=processes, chunk=chunk)
+    return {"cer": get_error_rate(counts), **counts}
+
+def wer(references, hypotheses, processes: int = None, chunk: int = 10000) -> float:
+    """The word error rate of the hypotheses, as jiwer.wer."""
+    return process_words(references, hypotheses, processes=processes, chunk=chunk)["wer"]
+
+def cer(references, hypotheses, processes: int = None, chunk: int = 10000) -> float:
+    """The character error rate of the hypotheses, as jiwer.cer."""
+    return process_characters(references, hypotheses, processes=processes, chunk=chunk)["cer"]
@@ -0,0 +1,20 @@
+from typing import Callable, List, Tuple
+
+def nearest_by_radius(query: Callable[[int], List[Tuple[str, int]]], k: int, radius: int) -> List[Tuple[str, int]]:
+    """
+    The k closest words found by an index, trying the radiuses 0, 1, ..., radius in turn.
+    Small radiuses prune or probe little of an index, so the first radius with k words
+    is usually found long before a query with the whole radius would finish.
+
+    Args:
+        query:          the (word, distance) pairs within a radius, sorted by distance
+                        and then by insertion order (Callable[[int], List[Tuple[str, int]]])
+        k:              the number of words to return (int)
+        radius:         the largest radius to try (int)
+    """
+    found = []
+    for radius_current in range(radius + 1):
+        found = query(radius_current)
+        if len(found) >= k:
+            break
+    return found[:k]
@@ -0,0 +1,150 @@
+"""
+All-pairs distances over a collection of strings.
+
+The matrix is split into tiles of tile x tile strings. Distances are symmetric,
+so only the tiles on and above the diagonal are computed, each as one
+solver.many call per row of the tile against the packed columns of the tile,
+and only the upper triangle of the tiles on the diagonal itself.
+Tiles run in a pool of processes and are written into the output as they finish,
+which may be a memory-mapped .npy file for matrices larger than RAM.
+
+```python3
+strings = ["kitten", "sitting", "mitten", "bitten"]
+condensed = pairwise(strings, Levenshtein())                 # in the order of scipy.spatial.distance.pdist
+matrix = pairwise(strings, Levenshtein(), square=True)
+```
+"""
+import multiprocessing
+import numpy as np
+from typing import Iterator, List, Tuple
+from .frameworks import ScoredDistance
+from .batch import PackedWords
+
+# The strings and the solver of a worker process, inherited on fork or set by init_worker
+worker_strings = None
+worker_solver = None
+
+# Fewer pairs than this are computed in the calling process, since starting a pool costs more
+PARALLEL_PAIRS = 50_000
+
+def init_worker(strings: List[str], solver) -> None:
+    global worker_strings, worker_solver
+    worker_strings = strings
+    worker_solver = solver
+
+def compute_tile(bounds: Tuple[Tuple[int, int], Tuple[int, int]]) -> Tuple[Tuple[int, int], Tuple[int, int], np.ndarray]:
+    """
+    Distances from each of the strings in the rows to each of the strings in the columns of a tile.
+    A tile on the diagonal is symmetric, so each row is only compared from the diagonal on,
+    and the lower triangle is mirrored from the upper one.
+    """
+    rows, columns = bounds
+    if rows == columns:
+        block = np.zeros((rows[1] - rows[0], columns[1] - columns[0]), dtype=np.float64)
+        for i in range(*rows):
+            words = worker_strings[i:columns[1]]
+            if hasattr(worker_solver, "many"):
+                block[i - rows[0], i - columns[0]:] = worker_solver.many(worker_strings[i], words)
+            else:
+                block[i - rows[0], i - columns[0]:] = [worker_solver.distance(worker_strings[i], word) for word in words]
+        return rows, columns, np.triu(block) + np.triu(block, 1).T
+
+    packed = PackedWords(worker_strings[columns[0]:columns[1]])
+    if hasattr(worker_solver, "many"):
+        block = [worker_solver.many(worker_strings[i], packed) for i in range(*rows)]
+    else:
+        block = [[worker_solver.distance(worker_strings[i], word) for word in packed] for i in range(*rows)]
+    return rows, columns, np.array(block).reshape(rows[1] - rows[0], columns[1] - columns[0])
+
+def get_tiles(count: int, tile: int) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Row and column ranges of the tiles on and above the diagonal."""
+    for start_1 in range(0, count, tile):
+        for start_2 in range(start_1, count, tile):
+            yield (start_1, min(start_1 + tile, count)), (start_2, min(start_2 + tile, count))
+
+def pairwise(
+        strings: List[str],
+        solver,
+        square: bool = False,
+        tile: int = 256,
+        processes: int = None,
+        out: str = None
+        ) -> np.ndarray:
+    """
+    Distances (or scores) between all the pairs of strings. The solver is assumed
+    to be symmetric, which holds for all the algorithms of this package.
+
+    Args:
+        strings:            strings to compare (List[str])
+        solver:             any algorithm of this package, such as Levenshtein()
+        square:             the full n x n matrix, or the condensed upper triangle without
+                            the diagonal, as scipy.spatial.distance.pdist returns (bool)
+        tile:               the number of strings per side of a tile (int)
+        processes:          the number of worker processes, all the cores if None,
+                            or only the calling process below PARALLEL_PAIRS pairs (int)
+        out:                path of a .npy file to memory-map the result into, in memory if None (str)
+
+    Returns:
+        The matrix of shape (n, n) if square, else of shape (n * (n - 1) / 2,).
+        Integers for distances, floats for scores of ScoredDistance algorithms.
+    """
+    global worker_strings, worker_solver
+    strings = list(strings)
+    count = len(strings)
+    shape = (count, count) if square else (count * (count - 1) // 2,)
+    dtype = np.float64 if isinstance(solver, ScoredDistance) else np.int64
+    if out is None:
+        result = np.zeros(shape, dtype=dtype)
+    else:
+        result = np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=shape)
+
+    if processes is None:
+        processes = 1 if count * (count - 1) // 2 < PARALLEL_PAIRS else multiprocessing.cpu_count()
+    # No more processes than tiles
+    tiles_count = -(-count // tile)
+    processes = max(1, min(processes, tiles_count * (tiles_count + 1) // 2))
+    tiles = get_tiles(count, tile)
+    try:
+        if processes == 1:
+            worker_strings, worker_solver = strings, solver
+            for bounds in tiles:
+                write_tile(result, count, square, *compute_tile(bounds))
+        else:
+            if "fork" in multiprocessing.get_all_start_methods():
+                worker_strings, worker_solver = strings, solver
+                pool = multiprocessing.get_context("fork").Pool(processes)
+            else:
+                pool = multiprocessing.Pool(processes, initializer=init_worker, initargs=(strings, solver))
+            with pool:
+                # Tiles are written as they finish, so only a few of them are held in memory
+                for rows, columns, block in pool.imap_unordered(compute_tile, tiles):
+                    write_tile(result, count, square, rows, columns, block)
+    finally:
+        # The strings must not outlive the call through the globals of this process
+        worker_strings, worker_solver = None, None
+
+    if out is not None:
+        result.flush()
+    return result
+
+def write_tile(
+        result: np.ndarray,
+        count: int,
+        square: bool,
+        rows: Tuple[int, int],
+        columns: Tuple[int, int],
+        block: np.ndarray
+        ) -> None:
+    """Writing a tile and, for the square matrix, its mirror below the diagonal."""
+    if square:
+        result[rows[0]:rows[1], columns[0]:columns[1]] = block
+        result[columns[0]:columns[1], rows[0]:rows[1]] = block.T
+        return
+
+    # Pairs (i, j) with i < j of a row are contiguous in the condensed matrix
+    for i in range(*rows):
+        start = max(columns[0], i + 1)
+        if start >= columns[1]:
+            continue
+        position = count * i - i * (i + 1) // 2 + start - i - 1
+        result[position:position + columns[1] - start] = block[i - rows[0], start - columns[0]:]
@@ -0,0 +1,123 @@
+import numpy as np
+from typing import Dict, Iterable, List, Tuple
+from .algorithms import DamerauLevenshtein
+from .nearest import nearest_by_radius
+
+# Words are padded on both sides, so that their first and last characters are covered by q q-grams too
+PAD = "\0"
+
+class QGramIndex:
+    """
+    Inverted index of character q-grams. Padded with q - 1 characters on both sides,
+    a word of length n has n + q - 1 q-grams, and a single edit changes at most q of them,
+    or q + 1 for a transposition of DamerauLevenshtein. So two words within the radius k
+    share at least max(n, m) + q - 1 - k * q of their q-grams (count filtering), and only
+    the words passing the filter and the length filter are compared by the solver.
+
+    Unlike the letter buckets of AutoCorrection.narrow_down, no character of a word
+    is trusted, so typos in the first letters are found as well.
+
+    For more details --> https://doi.org/10.1016/0304-3975(92)90143-4 (Ukkonen)
+
+    Args:
+        words:          words to index, duplicates are skipped (Iterable[str])
+        solver:         any edit distance algorithm from utils.edit_distance with integer distances
+        q:              the length of the grams (int)
+
+    ```python3
+    index = QGramIndex(["bottle", "battle", "little"], Levenshtein(), q=2)
+    index.query("vottle", 1)     # [("bottle", 1)]
+    ```
+    """
+    def __init__(self, words: Iterable[str], solver, q: int = 2):
+        self.q = q
+        self.set_solver(solver)
+        self.words = list(dict.fromkeys(words))
+        self.members = {word: idx for idx, word in enumerate(self.words)}
+        self.lengths = np.fromiter(map(len, self.words), dtype=np.int64, count=len(self.words))
+
+        # Each gram gets an id, and each word counts its grams
+        self.grams = {}
+        gram_ids = []
+        word_ids = []
+        counts = []
+        for idx, word in enumerate(self.words):
+            for gram, count in self.get_grams(word).items():
+                gram_ids.append(self.grams.setdefault(gram, len(self.grams)))
+                word_ids.append(idx)
+                counts.append(count)
+        gram_ids = np.array(gram_ids, dtype=np.int64)
+
+        # Words grouped by gram, self.postings[self.offsets[g]:self.offsets[g + 1]] for the gram id g
+        order = np.argsort(gram_ids, kind="stable")
+        self.offsets = np.searchsorted(gram_ids[order], np.arange(len(self.grams) + 1)).astype(np.int64)
+        self.postings = np.array(word_ids, dtype=np.int32)[order]
+        self.counts = np.array(counts, dtype=np.int32)[order]
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word: str):
+        return word in self.members
+
+    def set_solver(self, solver) -> None:
+        """The grams do not depend on the solver, only the number of grams an edit may change."""
+        self.solver = solver
+        self.per_edit = self.q + 1 if isinstance(solver, DamerauLevenshtein) else self.q
+
+    def get_grams(self, word: str) -> Dict[str, int]:
+        """The q-grams of the padded word paired with their counts."""
+        padded = PAD * (self.q - 1) + word + PAD * (self.q - 1)
+        grams = {}
+        for i in range(len(padded) - self.q + 1):
+            gram = padded[i:i + self.q]
+            grams[gram] = grams.get(gram, 0) + 1
+        return grams
+
+    def get_shared(self, word: str) -> np.ndarray:
+        """The number of q-grams each of the words shares with the word, counted as multisets."""
+        ids = []
+        shared = []
+        for gram, count in self.get_grams(word).items():
+            gram_id = self.grams.get(gram)
+            if gram_id is None:
+                continue
+            start, end = self.offsets[gram_id], self.offsets[gram_id + 1]
+            ids.append(self.postings[start:end])
+            shared.append(np.minimum(self.counts[start:end], count))
+        if len(ids) == 0:
+            return np.zeros(len(self.words), dtype=np.int64)
+        return np.bincount(np.concatenate(ids), weights=np.concatenate(shared), minlength=len(self.words)).astype(np.int64)
+
+    def get_candidates(self, word: str, radius: int, shared: np.ndarray = None) -> np.ndarray:
+        """Ids of the words passing the length and the count filters, in insertion order."""
+        if shared is None:
+            shared = self.get_shared(word)
+        threshold = np.maximum(self.lengths, len(word)) + self.q - 1 - self.per_edit * radius
+        return np.flatnonzero((shared >= threshold) & (np.abs(self.lengths - len(word)) <= radius))
+
+    def query(self, word: str, radius: int, shared: np.ndarray = None) -> List[Tuple[str, int]]:
+        """
+        All the words within the radius from the word, as (word, distance) pairs
+        sorted by distance and then by insertion order.
+        """
+        found = []
+        for idx in self.get_candidates(word, radius, shared).tolist():
+            distance = int(self.solver.distance(word, self.words[idx], max_distance=radius))
+            if distance <= radius:
+                found.append((distance, idx))
+        return [(self.words[idx], distance) for distance, idx in sorted(found)]
+
+    def nearest(self, word: str, k: int = 1, max_distance: int = None) -> List[Tuple[str, int]]:
+        """
+        The k closest words to the word, as (word, distance) pairs sorted by distance
+        and then by insertion order.
+        """
+        # No distance exceeds the length of the longer word
+        radius = max(len(word), int(self.lengths.max(initial=0)))
+        if max_distance is not None:
+            radius = min(radius, max_distance)
+
+        # The grams are counted once, and small radiuses with few candidates are tried first
+        shared = self.get_shared(word)
+        return nearest_by_radius(lambda radius_current: self.query(word, radius_current, shared), k, radius)
@@ -0,0 +1,245 @@
+import heapq
+import numpy as np
+from typing import Callable, List, Sequence, Tuple
+from .frameworks import Distance
+from .dtypes import get_dtype
+from .substitution import SubstitutionMatrix
+from . import batch
+
+class SmithWaterman(Distance):
+    """
+    Smith-Waterman algorithm finds the best scoring local alignment of two sequences,
+    that is, of any substring of one with any substring of the other. Unlike
+    NeedlemanWunsch, no cell drops below 0, so an alignment may start anywhere, and
+    the score is the maximum of the subproblem map instead of its last cell.
+
+    The recursive matrix approach is used by self.step method. self.distance builds
+    the query profile of word_1 once - the score of every character of the alphabet
+    against every position of word_1 - so each row of word_2 is a single lookup
+    followed by NumPy row operations, as in the query profiles of Farrar's striped
+    algorithm. Gaps along a row are resolved by a running maximum, as in NeedlemanWunsch,
+    which gives the exact row at once, so the lazy correction loop of the striped layout
+    is not needed. self.top_hits scans a database of sequences with self.many.
+
+    For more details --> https://en.wikipedia.org/wiki/Smith%E2%80%93Waterman_algorithm
+                     --> https://doi.org/10.1093/bioinformatics/btl582 (Farrar)
+
+    Args:
+        match_score:            the score of a pair of equal characters, without matrix (int)
+        mismatch_score:         the score of a pair of different characters, without matrix (int)
+        gap_penalty:            the score of a gap character, or of the first one with gap_extend (int)
+        gap_extend (optional):  the score of every next character of a gap, no lower than gap_penalty (int)
+        matrix (optional):      the scores of pairs of characters, instead of match_score and mismatch_score (SubstitutionMatrix)
+
+    ```python3
+    matrix = SubstitutionMatrix.load("../data/matrices/BLOSUM62", unknown="X")
+    solver = SmithWaterman(gap_penalty=-11, gap_extend=-1, matrix=matrix)
+    solver("HEAGAWGHEE", "PAWHEAE")             # 17
+    solver.top_hits("PAWHEAE", ["HEAGAWGHEE", "MKV", "PAWHEA"], k=2)  # [(2, 39), (0, 17)]
+    ```
+    """
+    def __init__(self, match_score: int = 2, mismatch_score: int = -1, gap_penalty: int = -2,
+                 gap_extend: int = None, matrix: SubstitutionMatrix = None):
+        self.match_score = match_score
+        self.mismatch_score = mismatch_score
+        self.gap_penalty = gap_penalty
+        self.gap_extend = gap_extend
+        self.matrix = matrix
+
+        # Opening a gap must cost at least as much as extending it, see self.get_score
+        if gap_extend is not None and gap_extend < gap_penalty:
+            raise ValueError("gap_extend {} is lower than gap_penalty {}".format(gap_extend, gap_penalty))
+
+        # Query profile of the last word_1, reused while the same word is compared
+        self.profile_word = None
+        self.profile = None
+
+    def __call__(self, word_1: str, word_2: str, max_distance: int = None):
+        """
+        The score of the best local alignment. Affine gaps have no subproblem map,
+        so their score is computed by self.distance.
+        """
+        if max_distance is not None or self.gap_extend is not None:
+            return self.distance(word_1, word_2, max_distance=max_distance)
+        self.update_words(word_1=word_1, word_2=word_2)
+        self.run()
+        return int(self.subproblem_map.max())
+
+    def get_largest(self) -> int:
+        """The largest absolute value of a score."""
+        scores = [self.match_score, self.mismatch_score, self.gap_penalty, self.gap_extend or 0]
+        if self.matrix is not None:
+            scores.append(int(np.abs(self.matrix.scores).max()))
+        return max(abs(score) for score in scores)
+
+    def get_profile(self, word: str) -> Tuple[Callable[[np.ndarray], np.ndarray], np.ndarray]:
+        """
+        The query profile of the word, and the function mapping code points to its rows.
+
+        Returns:
+            encode:     maps code points (np.ndarray) to rows of the profile
+            profile:    profile[r, j] is the score of the characters of row r against word[j] (np.ndarray)
+        """
+        if self.profile_word == word:
+            return self.profile
+        codes = batch.encode(word)
+        if self.matrix is not None:
+            encode = self.matrix.encode
+            profile = self.matrix.scores[:, self.matrix.encode(codes)]
+        else:
+            alphabet = np.unique(codes)
+            # The last row stands for all the characters that are not in the word
+            profile = np.full((len(alphabet) + 1, len(codes)), self.mismatch_score, dtype=np.int64)
+            profile[np.searchsorted(alphabet, codes), np.arange(len(codes))] = self.match_score
+
+            def encode(codes_other: np.ndarray) -> np.ndarray:
+                idx = np.minimum(np.searchsorted(alphabet, codes_other), max(len(alphabet) - 1, 0))
+                found = alphabet[idx] == codes_other if len(alphabet) > 0 else np.zeros(np.shape(codes_other), dtype=bool)
+                return np.where(found, idx, len(alphabet))
+
+        self.profile_word = word
+        self.profile = (encode, profile)
+        return self.profile
+
+    def get_score(self, profile: np.ndarray, rows: np.ndarray) -> int:
+        """
+        The best local score, one NumPy row operation per character of word_2.
+
+        h is the best score of a cell, and f the best score ending with a gap in word_1
+        (coming from the row above). The best score ending with a gap in word_2 (coming from
+        the left) is e[j] = max(t[k] + gap_penalty + (j - k - 1) * gap_extend) over k < j,
+        where t is the best score of the cell without it, a running maximum as in
+        NeedlemanWunsch.get_rows. Without gap_extend, gaps are linear, f is dominated by
+        the cell above and the same recurrence holds.
+        """
+        length = profile.shape[1]
+        gap_open = self.gap_penalty
+        gap_extend = self.gap_penalty if self.gap_extend is None else self.gap_extend
+        dtype = get_dtype(2 * (length + len(rows) + 1) * self.get_largest(), signed=True)
+        profile = profile.astype(dtype)
+        extends = np.arange(length + 1, dtype=dtype) * dtype(gap_extend)
+
+        # Cells never drop below 0, so gaps never drop below gap_open
+        h = np.zeros(length + 1, dtype=dtype)
+        f = np.full(length + 1, gap_open, dtype=dtype)
+        t = np.zeros(length + 1, dtype=dtype)
+        best = 0
+        for row in rows.tolist():
+            f = np.maximum(f + dtype(gap_extend), h + dtype(gap_open))
+            np.maximum(h[:-1] + profile[row], f[1:], out=t[1:])
+            np.maximum(t, 0, out=t)
+
+            e = np.maximum.accumulate(t - extends)[:-1] + extends[1:] + dtype(gap_open - gap_extend)
+            h = np.empty_like(t)
+            h[0] = 0
+            np.maximum(t[1:], e, out=h[1:])
+            best = max(best, int(h.max()))
+        return best
+
+    def distance(self, word_1: str, word_2: str, max_distance: int = None) -> int:
+        """
+        The score of the best local alignment, computed with the query profile of word_1.
+        With max_distance, max_distance + 1 is returned if the score exceeds it, as by Distance.distance.
+        """
+        encode, profile = self.get_profile(word_1)
+        score = self.get_score(profile, encode(batch.encode(word_2)))
+        if max_distance is not None and score > max_distance:
+            return max_distance + 1
+        return score
+
+    def many(self, query: str, candidates) -> np.ndarray:
+        """
+        Scores of the query against each of the candidates (List[str] or batch.PackedWords), computed together.
+
+        The rows of all the subproblem maps are computed at once, one NumPy row operation
+        per character of the query, and the scores of each row are gathered from
+        the query profile. Cells past the end of shorter candidates never feed the cells
+        of the candidate itself, and they are masked out of the maximum.
+        """
+        packed = batch.pack(candidates)
+        encode, profile = self.get_profile(query)
+        gap_open = self.gap_penalty
+        gap_extend = self.gap_penalty if self.gap_extend is None else self.gap_extend
+        width = packed.codes.shape[1]
+        dtype = get_dtype(2 * (len(query) + width + 1) * self.get_largest(), signed=True)
+        profile = profile.astype(dtype)
+        extends = np.arange(width + 1, dtype=dtype) * dtype(gap_extend)
+
+        filled = np.arange(width) < packed.lengths[:, None]
+        rows = np.zeros(packed.codes.shape, dtype=np.int64)
+        rows[filled] = encode(packed.codes[filled])
+
+        h = np.zeros((len(packed), width + 1), dtype=dtype)
+        f = np.full_like(h, gap_open)
+        t = np.zeros_like(h)
+        best = np.zeros_like(h)
+        for j in range(len(query)):
+            f = np.maximum(f + dtype(gap_extend), h + dtype(gap_open))
+            np.maximum(h[:, :-1] + profile[rows, j], f[:, 1:], out=t[:, 1:])
+            np.maximum(t, 0, out=t)
+
+            e = np.maximum.accumulate(t - extends, axis=1)[:, :-1] + extends[1:] + dtype(gap_open - gap_extend)
+            h = np.empty_like(t)
+            h[:, 0] = 0
+            np.maximum(t[:, 1:], e, out=h[:, 1:])
+            np.maximum(best, h, out=best)
+        return np.where(filled, best[:, 1:], 0).max(axis=1, initial=0)
+
+    def top_hits(self, query: str, database: Sequence[str], k: int = 10, chunk: int = 1024) -> List[Tuple[int, int]]:
+        """
+        The k sequences of the database with the best local alignments to the query.
+
+        The database is scanned in chunks of sequences of similar lengths,
+        so that little of each chunk is padding.
+
+        Args:
+            query:          the query sequence (str)
+            database:       the sequences to search (Sequence[str])
+            k:              the number of hits to return (int)
+            chunk:          the number of sequences compared at once by self.many (int)
+        Returns:
+            (index in the database, score) pairs sorted by score and then by index.
+        """
+        lengths = np.fromiter(map(len, database), dtype=np.int64, count=len(database))
+        order = np.argsort(lengths, kind="stable")
+
+        # Min-heap of the best (score, -index) found so far
+        found = []
+        for start in range(0, len(order), chunk):
+            idx = order[start:start + chunk].tolist()
+            scores = self.many(query, [database[i] for i in idx])
+            for i, score in zip(idx, scores.tolist()):
+                item = (score, -i)
+                if len(found) < k:
+                    heapq.heappush(found, item)
+                elif item > found[0]:
+                    heapq.heapreplace(found, item)
+        return [(-i, score) for score, i in sorted(found, reverse=True)]
+
+    def run(self):
+        for i in range(1, self.height):
+            for j in range(1, self.width):
+                self.step(i, j)
+
+    def step(self, i, j):
+        char_1, char_2 = self.word_1[j - 1], self.word_2[i - 1]
+        if self.matrix is not None:
+            score = self.matrix.score(char_1, char_2)
+        else:
+            score = self.match_score if char_1 == char_2 else self.mismatch_score
+        self.subproblem_map[i, j] = max(
+            0,                                                      # a new alignment
+            self.subproblem_map[i - 1, j] + self.gap_penalty,
+            self.subproblem_map[i, j - 1] + self.gap_penalty,
+            self.subproblem_map[i - 1, j - 1] + score
+        )
+
+    def update_words(self, word_1: str, word_2: str):
+        """Here words represent DNA/RNA or proteins"""
+        self.word_1 = word_1
+        self.word_2 = word_2
+
+        self.width = len(word_1) + 1
+        self.height = len(word_2) + 1
+        dtype = get_dtype(2 * (self.width + self.height) * self.get_largest(), signed=True)
+        self.subproblem_map = np.zeros((self.height, self.width), dtype=dtype)
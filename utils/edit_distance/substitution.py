@@ -0,0 +1,74 @@
+"""
+Substitution matrices scoring every pair of characters of an alphabet,
+such as BLOSUM62 for proteins or a nucleotide matrix for DNA, for SmithWaterman.
+
+Matrices are read from text files in the format of the NCBI matrices - comment lines
+starting with "#", a header line with the alphabet, and a line per character
+starting with the character itself. See data/matrices for examples.
+
+For more details --> https://en.wikipedia.org/wiki/Substitution_matrix
+                 --> https://ftp.ncbi.nih.gov/blast/matrices/
+
+```python3
+matrix = SubstitutionMatrix.load("../data/matrices/BLOSUM62", unknown="X")
+matrix.score("W", "W")      # 11
+matrix.score("W", "U")      # -2, scored as "X"
+```
+"""
+import numpy as np
+from . import batch
+
+class SubstitutionMatrix:
+    """
+    Args:
+        alphabet:               the characters of the matrix (str)
+        scores:                 the score of each pair of characters, in the order of the alphabet (np.ndarray)
+        unknown (optional):     the character of the alphabet standing for any character outside it.
+                                Without it, characters outside the alphabet raise ValueError (str)
+    """
+    def __init__(self, alphabet: str, scores: np.ndarray, unknown: str = None):
+        scores = np.asarray(scores, dtype=np.int64)
+        if scores.shape != (len(alphabet), len(alphabet)):
+            raise ValueError("scores of shape {} do not match the alphabet of {} characters".format(scores.shape, len(alphabet)))
+        if len(set(alphabet)) != len(alphabet):
+            raise ValueError("The alphabet {} has repeated characters".format(alphabet))
+        if unknown is not None and unknown not in alphabet:
+            raise ValueError("The unknown character {} is not in the alphabet".format(unknown))
+        self.alphabet = alphabet
+        self.scores = scores
+        self.unknown = unknown
+
+        # Code points sorted for bisection, and the position of each of them in the alphabet
+        codes = batch.encode(alphabet)
+        self.order = np.argsort(codes)
+        self.codes = codes[self.order]
+
+    @classmethod
+    def load(cls, path: str, unknown: str = None) -> "SubstitutionMatrix":
+        """Reading a matrix in the format of the NCBI matrices."""
+        with open(path) as f:
+            lines = [line.split() for line in f if line.strip() and not line.startswith("#")]
+        alphabet = "".join(lines[0])
+        if "".join(line[0] for line in lines[1:]) != alphabet:
+            raise ValueError("The rows of {} do not follow the header {}".format(path, alphabet))
+        scores = [[int(value) for value in line[1:]] for line in lines[1:]]
+        return cls(alphabet, scores, unknown=unknown)
+
+    def __len__(self):
+        return len(self.alphabet)
+
+    def encode(self, codes: np.ndarray) -> np.ndarray:
+        """Positions in the alphabet of code points, as returned by batch.encode."""
+        idx = np.minimum(np.searchsorted(self.codes, codes), len(self.codes) - 1)
+        found = self.codes[idx] == codes
+        positions = self.order[idx]
+        if not found.all():
+            if self.unknown is None:
+                missing = chr(int(np.asarray(codes)[~found].flat[0]))
+                raise ValueError("{} is not in the alphabet {}".format(repr(missing), self.alphabet))
+            positions = np.where(found, positions, self.alphabet.index(self.unknown))
+        return positions
+
+    def score(self, char_1: str, char_2: str) -> int:
+        idx_1, idx_2 = self.encode(batch.encode(char_1 + char_2))
+        return int(self.scores[idx_1, idx_2])
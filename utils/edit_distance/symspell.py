@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import numpy as np
+from typing import Iterable, List, Set, Tuple
+from .nearest import nearest_by_radius
+
+class SymSpell:
+    """
+    Symmetric delete index. Every string obtained from a word by deleting up to
+    max_edit characters is precomputed. Two words within max_edit operations
+    share at least one of such deletions, so candidates of a query are found
+    with hash probes of its own deletions, and only those candidates are
+    compared by the solver.
+
+    The deletions are stored as sorted 64-bit hashes pointing to lists of word ids,
+    which can be saved to a directory of .npy files and memory-mapped on load.
+    Hash collisions only add candidates, which are then rejected by the solver.
+
+    For more details --> https://github.com/wolfgarbe/SymSpell
+
+    Args:
+        words:          words to index, duplicates are skipped (Iterable[str])
+        solver:         any edit distance algorithm from utils.edit_distance with integer distances
+        max_edit:       the largest radius a query can have (int)
+
+    ```python3
+    index = SymSpell(["bottle", "battle", "little"], Levenshtein(), max_edit=2)
+    index.query("bottel", 2)     # [("bottle", 2)]
+    index.save("./data/symspell")
+    index = SymSpell.load("./data/symspell", Levenshtein())
+    ```
+    """
+    def __init__(self, words: Iterable[str], solver, max_edit: int = 2):
+        self.solver = solver
+        self.max_edit = max_edit
+        self.words = list(dict.fromkeys(words))
+        self.members = {word: idx for idx, word in enumerate(self.words)}
+
+        hashes = []
+        ids = []
+        for idx, word in enumerate(self.words):
+            deletions = get_deletions(word, max_edit)
+            hashes.extend(map(get_hash, deletions))
+            ids.extend([idx] * len(deletions))
+        hashes = np.array(hashes, dtype=np.uint64)
+        ids = np.array(ids, dtype=np.int32)
+
+        # Ids grouped by hash, self.postings[self.offsets[k]:self.offsets[k + 1]] for self.hashes[k]
+        order = np.argsort(hashes, kind="stable")
+        self.hashes, starts = np.unique(hashes[order], return_index=True)
+        self.offsets = np.append(starts, len(order)).astype(np.int64)
+        self.postings = ids[order]
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word: str):
+        return word in self.members
+
+    def set_solver(self, solver) -> None:
+        """The deletions do not depend on the solver, so only the verification changes."""
+        self.solver = solver
+
+    def save(self, path: str) -> None:
+        """Saving the index to the directory path."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "hashes.npy"), self.hashes)
+        np.save(os.path.join(path, "offsets.npy"), self.offsets)
+        np.save(os.path.join(path, "postings.npy"), self.postings)
+        with open(os.path.join(path, "words.json"), "w") as f:
+            json.dump({"max_edit": self.max_edit, "words": self.words}, f)
+
+    @classmethod
+    def load(cls, path: str, solver) -> "SymSpell":
+        """Loading the index saved to the directory path, with the arrays memory-mapped."""
+        index = cls.__new__(cls)
+        index.solver = solver
+        with open(os.path.join(path, "words.json")) as f:
+            saved = json.load(f)
+        index.max_edit = saved["max_edit"]
+        index.words = saved["words"]
+        index.members = {word: idx for idx, word in enumerate(index.words)}
+        index.hashes = np.load(os.path.join(path, "hashes.npy"), mmap_mode="r")
+        index.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        index.postings = np.load(os.path.join(path, "postings.npy"), mmap_mode="r")
+        return index
+
+    def get_candidates(self, word: str, radius: int) -> Set[int]:
+        """Ids of the words sharing a deletion with the word."""
+        hashes = np.array([get_hash(deletion) for deletion in get_deletions(word, radius)], dtype=np.uint64)
+        positions = np.searchsorted(self.hashes, hashes)
+        inside = positions < len(self.hashes)
+        positions = positions[inside]
+        positions = positions[self.hashes[positions] == hashes[inside]]
+
+        candidates = set()
+        for position in positions:
+            candidates.update(self.postings[self.offsets[position]:self.offsets[position + 1]].tolist())
+        return candidates
+
+    def query(self, word: str, radius: int) -> List[Tuple[str, int]]:
+        """
+        All the words within the radius from the word, as (word, distance) pairs
+        sorted by distance and then by insertion order.
+        """
+        if radius > self.max_edit:
+            raise ValueError("radius {} exceeds max_edit {} of the index".format(radius, self.max_edit))
+        found = []
+        for idx in self.get_candidates(word, radius):
+            distance = int(self.solver.distance(word, self.words[idx], max_distance=radius))
+            if distance <= radius:
+                found.append((distance, idx))
+        return [(self.words[idx], distance) for distance, idx in sorted(found)]
+
+    def nearest(self, word: str, k: int = 1, max_distance: int = None) -> List[Tuple[str, int]]:
+        """
+        The k closest words to the word, as (word, distance) pairs sorted by distance
+        and then by insertion order. Words farther than max_edit are never found.
+        """
+        radius = self.max_edit if max_distance is None else min(max_distance, self.max_edit)
+
+        # Small radiuses need few probes, so they are tried first
+        return nearest_by_radius(lambda radius_current: self.query(word, radius_current), k, radius)
+
+def get_deletions(word: str, max_edit: int) -> Set[str]:
+    """The word itself and all the strings obtained by deleting up to max_edit characters."""
+    deletions = {word}
+    frontier = {word}
+    for _ in range(max_edit):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+        deletions |= frontier
+    return deletions
+
+def get_hash(text: str) -> int:
+    """64-bit hash, stable across processes unlike the built-in hash of strings."""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
@@ -0,0 +1,149 @@
+import heapq
+from typing import Iterable, List, Tuple
+from .algorithms import DamerauLevenshtein, Levenshtein
+from .nearest import nearest_by_radius
+
+class Trie:
+    """
+    Prefix tree of words searched with the rows of the subproblem map. A node stands
+    for a prefix shared by all the words below it, so its row is computed once from
+    the row of its parent and reused by all of them, instead of once per word.
+
+    A subtree is pruned once the minimum of its row exceeds the radius, since the rows
+    below never decrease. DamerauLevenshtein (optimal string alignment) looks two rows back
+    for transpositions, so both the row and the row of the parent must exceed the radius.
+
+    For more details --> https://en.wikipedia.org/wiki/Trie
+                     --> http://stevehanov.ca/blog/?id=114
+
+    Args:
+        words:          words to index, duplicates are skipped (Iterable[str])
+        solver:         Levenshtein or DamerauLevenshtein, only its type is used
+
+    ```python3
+    trie = Trie(["bottle", "bottom", "battle"], Levenshtein())
+    trie.query("bottel", 2)     # [("bottle", 2), ("bottom", 2)]
+    trie.nearest("bottel", 1)   # [("bottle", 2)]
+    ```
+    """
+    def __init__(self, words: Iterable[str], solver):
+        self.set_solver(solver)
+
+        # A node is a list of [{char: child node}, insertion order or -1 if no word ends there]
+        self.root = [{}, -1]
+        self.depth = 0
+        self.words = []
+        self.members = set()
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word: str):
+        return word in self.members
+
+    def set_solver(self, solver) -> None:
+        """The prefixes do not depend on the solver, only the recurrence of the rows."""
+        if not isinstance(solver, (Levenshtein, DamerauLevenshtein)):
+            raise ValueError("Trie supports Levenshtein and DamerauLevenshtein, not {}".format(type(solver).__name__))
+        self.solver = solver
+        self.transpositions = isinstance(solver, DamerauLevenshtein)
+
+    def add(self, word: str) -> None:
+        if word in self.members:
+            return
+        node = self.root
+        for char in word:
+            node = node[0].setdefault(char, [{}, -1])
+        node[1] = len(self.words)
+        self.depth = max(self.depth, len(word))
+        self.words.append(word)
+        self.members.add(word)
+
+    def get_row(self, word: str, char: str, previous: list, before: list, char_previous: str, radius: float) -> list:
+        """
+        The row of a child node for its char, from the row of the node (previous)
+        and, for transpositions, the row of its parent (before) with its char (char_previous).
+
+        Only the diagonal band of cells that can stay within the radius is filled,
+        the rest is capped at radius + 1, which stands for "beyond the radius".
+        """
+        i = previous[0] + 1
+        width = len(word) + 1
+        if radius == float("inf"):
+            start, end, bound = 1, width, float("inf")
+        else:
+            start, end, bound = max(1, i - radius), min(width, i + radius + 1), radius + 1
+        current = [bound] * width
+        current[0] = i
+        value = current[start - 1] if start < end else bound
+        for j in range(start, end):
+            char_1 = word[j - 1]
+            # value holds current[j - 1], so the insert is value + 1
+            value = min(value + 1, previous[j] + 1, previous[j - 1] + (char_1 != char), bound)
+            if before is not None and j > 1 and char_1 == char_previous and word[j - 2] == char:
+                value = min(value, before[j - 2] + (char_1 != char))    # transposition
+            current[j] = value
+        return current
+
+    def search(self, word: str, radius: float, k: int = None) -> List[Tuple[int, int, str]]:
+        """
+        Depth-first search of the words within the radius. With k, only the k best
+        are kept in a max-heap, and the radius shrinks to the distance of the k-th of them.
+
+        Returns:
+            (distance, insertion order, word) of the words found.
+        """
+        # Max-heap of (-distance, -insertion order, word) if k is given
+        found = []
+        stack = [(child, char, list(range(len(word) + 1)), None, None) for char, child in self.root[0].items()]
+        if self.root[1] != -1 and len(word) <= radius:
+            found.append((-len(word), -self.root[1], ""))
+        while stack:
+            node, char, previous, before, char_previous = stack.pop()
+            current = self.get_row(word, char, previous, before if self.transpositions else None, char_previous, radius)
+
+            if node[1] != -1 and current[-1] <= radius:
+                item = (-current[-1], -node[1], self.words[node[1]])
+                if k is None or len(found) < k:
+                    heapq.heappush(found, item)
+                elif item > found[0]:
+                    heapq.heapreplace(found, item)
+                if k is not None and len(found) == k:
+                    radius = min(radius, -found[0][0])
+
+            row_min = min(current)
+            if row_min > radius and (not self.transpositions or min(previous) > radius):
+                continue
+            for char_child, child in node[0].items():
+                stack.append((child, char_child, current, previous, char))
+        return [(-distance, -order, word_found) for distance, order, word_found in found]
+
+    def query(self, word: str, radius: int) -> List[Tuple[str, int]]:
+        """
+        All the words within the radius from the word, as (word, distance) pairs
+        sorted by distance and then by insertion order.
+        """
+        return [(word_found, distance) for distance, _, word_found in sorted(self.search(word, radius))]
+
+    def nearest(self, word: str, k: int = 1, max_distance: int = None) -> List[Tuple[str, int]]:
+        """
+        The k closest words to the word, as (word, distance) pairs sorted by distance
+        and then by insertion order.
+
+        Args:
+            word:               a query word (str)
+            k:                  the number of words to return (int)
+            max_distance:       if given, words farther than it are not returned (int)
+        """
+        # No distance exceeds the length of the longer word
+        radius = max(len(word), self.depth)
+        if max_distance is not None:
+            radius = min(radius, max_distance)
+
+        # Small radiuses prune most of the tree, so they are tried first, keeping the k best only
+        return nearest_by_radius(
+            lambda radius_current: [(word_found, distance) for distance, _, word_found in sorted(self.search(word, radius_current, k))],
+            k, radius
+            )